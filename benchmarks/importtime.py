@@ -0,0 +1,123 @@
+"""
+Import-time benchmark for joffrey, based on `python -X importtime`.
+
+Usage:
+  python benchmarks/importtime.py [--runs N] [--save FILE] [--baseline FILE] [--tolerance FRAC]
+
+Reports, for each statement below, the median time (in microseconds)
+it spends importing joffrey and everything joffrey pulls in ("imports"),
+and how much longer a fresh interpreter running it takes than one that
+does nothing ("total", which also counts whatever CLI() and parse() do
+besides importing). With --baseline, exits with status 1 if either got
+slower than the baseline by more than the given fraction.
+
+Bytecode is always written (and warmed up) first, even if
+PYTHONDONTWRITEBYTECODE is set, so compiling joffrey isn't measured.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = (
+  'import joffrey',
+  'from joffrey import CLI',
+  'from joffrey import CLI; CLI().parse([])',
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV = {name: value for name, value in os.environ.items() if name != 'PYTHONDONTWRITEBYTECODE'}
+
+
+def import_cost(stmt):
+    """
+    stmt: Python statement to run in a fresh interpreter
+    return: microseconds spent on top-level imports made by stmt
+      (i.e. all of joffrey's imports, including stdlib modules it
+      was first to import, but none of the interpreter's own startup)
+    """
+    baseline = _top_level(_importtime('pass'))
+    return sum(us for name, us in _top_level(_importtime(stmt)).items() if name not in baseline)
+
+
+def total_cost(stmt):
+    """
+    stmt: Python statement to run in a fresh interpreter
+    return: microseconds more than an interpreter doing nothing
+      takes to start up, run stmt, and exit
+    """
+    return _wall_time(stmt) - _wall_time('pass')
+
+
+def _wall_time(stmt):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', stmt], cwd=ROOT, env=ENV, check=True)
+    return (time.perf_counter() - start) * 1e6
+
+
+def _importtime(stmt):
+    proc = subprocess.run(
+      [sys.executable, '-X', 'importtime', '-c', stmt],
+      cwd=ROOT, env=ENV, stderr=subprocess.PIPE, universal_newlines=True, check=True
+      )
+    return proc.stderr.splitlines()
+
+
+def _top_level(lines):
+    """
+    return: {module name: cumulative microseconds} for modules imported
+      directly rather than by another module
+    """
+    found = {}
+    for line in lines:
+        _, cumulative, name = line.split('|')
+        if not cumulative.strip().isdigit():
+            # Header line
+            continue
+        if not name[1:].startswith(' '):
+            found[name.strip()] = int(cumulative)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure how long importing joffrey takes')
+    parser.add_argument('--runs', type=int, default=15)
+    parser.add_argument('--save', help='file to write results to as JSON')
+    parser.add_argument('--baseline', help='JSON file of previous results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown vs baseline, as a fraction')
+    args = parser.parse_args()
+
+    for stmt in STATEMENTS:
+        # (Writes bytecode for everything stmt imports)
+        _wall_time(stmt)
+    results = {
+      stmt: {
+        'imports': statistics.median(import_cost(stmt) for _ in range(args.runs)),
+        'total': statistics.median(total_cost(stmt) for _ in range(args.runs)),
+        }
+      for stmt in STATEMENTS
+      }
+    for stmt, costs in results.items():
+        print('{: >10.0f} us imports {: >10.0f} us total  {}'.format(costs['imports'], costs['total'], stmt))
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        slower = {
+          (stmt, kind): (baseline[stmt][kind], us)
+          for stmt, costs in results.items() if stmt in baseline
+          for kind, us in costs.items() if us > baseline[stmt][kind] * (1 + args.tolerance)
+          }
+        for (stmt, kind), (before, after) in slower.items():
+            print('REGRESSION: {!r} ({}) went from {:.0f} us to {:.0f} us'.format(stmt, kind, before, after))
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
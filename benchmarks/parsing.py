@@ -0,0 +1,188 @@
+"""
+Parsing benchmark for joffrey over synthetic CLIs.
+
+Usage:
+  python benchmarks/parsing.py [--flags N] [--groups N] [--clumps N] [--depth N]
+    [--consuming] [--input-length N] [--runs N] [--save FILE] [--baseline FILE] [--tolerance FRAC]
+
+Builds a CLI of the given shape -- that many flags, spread over that many
+groups, with every pair of flags among the first 2*clumps ORed together;
+a chain of `depth` nested commands shaped like it; and, with --consuming,
+an arg(...) on every parser -- plus an input that gives every parser
+roughly --input-length arguments. Then reports the median time (in
+microseconds) of each of:
+
+  define          defining the whole CLI from scratch
+  compile         compiling it (and its commands) after invalidating it
+  parse           cli.parse() of the input
+  enforce_clumps  checking the top-level parser's clumps against what the input gave it
+  help            rendering the top-level help screen, uncached
+
+With --baseline, exits with status 1 if anything got slower than the
+baseline by more than the given fraction. A baseline taken with a
+different shape is refused rather than compared against.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from joffrey import CLI, Group  # noqa: E402
+
+
+def _callback(name, takes_value):
+    """
+    return: new flag/arg callback called name (a new function each
+      time, since entities are keyed by their callbacks)
+    """
+    if takes_value:
+        def cb(value):
+            return value
+    else:
+        def cb():
+            return True
+    cb.__name__ = cb.__qualname__ = name
+    return cb
+
+
+def populate(parser, level, shape):
+    """
+    parser: Parser to add shape's flags, groups, clumps and args to
+    level: How deeply parser is nested (0 for the CLI itself)
+    
+    (Flags' names have no underscores, because a clumped flag whose name
+    differs from its identifier is never seen as given)
+    """
+    groups = [parser]
+    for g in range(shape['groups']):
+        setattr(parser, 'group{}'.format(g), Group())
+        groups.append(getattr(parser, 'group{}'.format(g)))
+    for i in range(shape['flags']):
+        owner = groups[i % len(groups)]
+        entity = owner.flag(short=None)(_callback('flag{}'.format(i), i % 2))
+        if i < 2 * shape['clumps']:
+            parser.clump(OR='{}-{}'.format(level, i // 2))(entity)
+    if shape['consuming']:
+        parser.arg(...)(_callback('rest', True))
+
+
+def define(shape):
+    """
+    return: CLI of the given shape
+    """
+    cli = parser = CLI(systemexit=False)
+    populate(cli, 0, shape)
+    for level in range(1, shape['depth'] + 1):
+        parser = parser.command('cmd{}'.format(level))
+        populate(parser, level, shape)
+    return cli
+
+
+def make_input(shape):
+    """
+    return: Input for a CLI of the given shape that passes every clump
+      and then works its way down to the innermost command
+    """
+    inp = []
+    for level in range(shape['depth'] + 1):
+        words = []
+        # One member of each OR clump, then whatever else fits
+        flags = [*range(0, 2 * shape['clumps'], 2), *range(2 * shape['clumps'], shape['flags'])]
+        for i in flags:
+            if len(words) >= shape['input_length']:
+                break
+            words.append('--flag{}'.format(i))
+            if i % 2:
+                words.append('value')
+        if shape['consuming']:
+            words.extend('item{}'.format(i) for i in range(shape['input_length'] - len(words)))
+        inp.extend(words)
+        if level < shape['depth']:
+            inp.append('cmd{}'.format(level + 1))
+    return inp
+
+
+def measure(func, runs):
+    """
+    return: median microseconds per call of func over the given number
+      of runs, each of however many calls takes at least 0.2 seconds
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return statistics.median(timer.repeat(repeat=runs, number=number)) / number * 1e6
+
+
+def benchmark(shape, runs):
+    """
+    return: {benchmark name: median microseconds} for the given shape
+    """
+    cli = define(shape)
+    inp = make_input(shape)
+    parsed = set(cli.parse(inp))
+
+    def compile_():
+        cli._invalidate()
+        cli.compile()
+
+    def help_():
+        cli._help_cache.clear()
+        cli.format_help()
+
+    return {
+      'define': measure(lambda: define(shape), runs),
+      'compile': measure(compile_, runs),
+      'parse': measure(lambda: cli.parse(inp), runs),
+      'enforce_clumps': measure(lambda: cli.enforce_clumps(parsed), runs),
+      'help': measure(help_, runs),
+      }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure how long parsing with joffrey takes')
+    parser.add_argument('--flags', type=int, default=200, help='flags per parser')
+    parser.add_argument('--groups', type=int, default=4, help='groups per parser (flags are spread across them)')
+    parser.add_argument('--clumps', type=int, default=10, help='OR clumps of two flags each, per parser')
+    parser.add_argument('--depth', type=int, default=2, help='how many commands deep the CLI goes')
+    parser.add_argument('--consuming', action='store_true', help="give every parser an arg(...)")
+    parser.add_argument('--input-length', type=int, default=100, help='arguments given to each parser')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--save', help='file to write results to as JSON')
+    parser.add_argument('--baseline', help='JSON file of previous results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown vs baseline, as a fraction')
+    args = parser.parse_args()
+
+    shape = {
+      name: getattr(args, name)
+      for name in ('flags', 'groups', 'clumps', 'depth', 'consuming', 'input_length')
+      }
+    if 2 * shape['clumps'] > shape['flags']:
+        parser.error('--clumps can be at most half of --flags')
+
+    results = benchmark(shape, args.runs)
+    for name, us in results.items():
+        print('{: >12.1f} us  {}'.format(us, name))
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'shape': shape, 'results': results}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline['shape'] != shape:
+            sys.exit('Baseline was taken with a different shape: {}'.format(baseline['shape']))
+        slower = {
+          name: (baseline['results'][name], us) for name, us in results.items()
+          if name in baseline['results'] and us > baseline['results'][name] * (1 + args.tolerance)
+          }
+        for name, (before, after) in slower.items():
+            print('REGRESSION: {} went from {:.1f} us to {:.1f} us'.format(name, before, after))
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,40 @@
-from . import simple
-from .core import CLI, Group
-from .misc import auto, booly
+import sys
+
+# Public name: submodule it's from (None if it *is* the submodule)
+_LAZY = {
+  'simple': None,
+  'CLI': 'core',
+  'Group': 'core',
+  'auto': 'misc',
+  'booly': 'misc',
+  'JoffreyNamespace': 'misc',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    """
+    Imports public names on first access, so that `import joffrey`
+    doesn't cost anything until joffrey is actually used
+    """
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name)) from None
+    # (Not using importlib because that would itself slow down `import joffrey`)
+    qualified = '{}.{}'.format(__name__, name if module is None else module)
+    __import__(qualified)
+    value = sys.modules[qualified] if module is None else getattr(sys.modules[qualified], name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY})
+
+
+if sys.version_info < (3, 7):
+    # No module-level __getattr__ (PEP 562), so import everything up front
+    for _name in _LAZY:
+        __getattr__(_name)
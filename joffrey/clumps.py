@@ -1,3 +1,6 @@
+from time import perf_counter
+
+from . import errors
 from .misc import multiton
 
 
@@ -78,3 +81,182 @@ class Xor(_Clump):
         return: entities not in `parsed` that were not expected to be present.
         """
         return frozenset(self.member_names.difference(parsed))
+
+
+def _and_ok(mask, parsed):
+    # Same as And.verify()
+    return not mask & ~parsed
+
+
+def _or_ok(mask, parsed):
+    # Same as Or.verify()
+    return bool(mask & parsed)
+
+
+def _xor_ok(mask, parsed):
+    # Same as Xor.verify(): exactly one bit of mask set in parsed
+    got = mask & parsed
+    return bool(got) and not got & (got - 1)
+
+
+class ClumpEngine:
+    """
+    A handler's AND/OR/XOR clumps compiled into integer bitmasks over
+    a fixed index of entity names, so that enforcing them is a few
+    bitwise ops per clump rather than set operations over names
+    """
+    def __init__(self, handler, groups=None):
+        """
+        handler: Handler whose clumps (and parent clumps) to compile
+        groups: Dict of {group name: Group} to take into account, if any
+        """
+        chain = {'AND': handler.parent_and, 'OR': handler.parent_or, 'XOR': handler.parent_xor}
+        own = {'AND': handler._and, 'OR': handler._or, 'XOR': handler._xor}
+        names = {name for clumps in chain.values() for c in clumps for name in c.member_names}
+        if groups is not None:
+            names.update(name for g in groups.values() for name in g.entity_names)
+        self._bits = {name: 1 << i for i, name in enumerate(names)}
+        
+        self._chain = {lbl: [self._mask(c.member_names) for c in clumps] for lbl, clumps in chain.items()}
+        self._own = {lbl: [self._mask(c.member_names) for c in clumps] for lbl, clumps in own.items()}
+        # Pairs of (group's own bit, bits of everything in the group)
+        self._group_masks = [] if groups is None else [
+          (self._bits[name], self._mask(g.entity_names))
+          for name, g in groups.items() if name in self._bits
+          ]
+        self.groups = groups
+        self.handler = repr(handler)
+    
+    def _mask(self, names):
+        mask = 0
+        for name in names:
+            mask |= self._bits.get(name, 0)
+        return mask
+    
+    def _names(self, mask):
+        return frozenset(name for name, bit in self._bits.items() if mask & bit)
+    
+    def _successes(self, label, verify, parsed):
+        """
+        return: Mask of all entities in this label's clumps (own and parents')
+          that are or are not in `parsed` as expected
+        """
+        suc = 0
+        for mask in self._chain[label]:
+            if verify(mask, parsed):
+                suc |= mask
+        for group_bit, members in self._group_masks:
+            if suc & group_bit:
+                suc |= members
+        return suc
+    
+    def _extract_names(self, collection):
+        if self.groups is None:
+            return map(repr, collection)
+        return (
+          '[{}]'.format(', '.join(map(repr, self.groups[n].entity_names)))
+          if n in self.groups else repr(n) for n in collection
+          )
+    
+    def _details(self, parsed, and_suc, or_suc, xor_suc, **kwargs):
+        return dict(
+          parsed=parsed,
+          groups=self.groups,
+          handler=self.handler,
+          AND_SUC=set(self._names(and_suc)),  # SUC = SUCCESSES
+          OR_SUC=set(self._names(or_suc)),
+          XOR_SUC=set(self._names(xor_suc)),
+          **{k: self._names(v) for k, v in kwargs.items()}
+          )
+    
+    def enforce(self, parsed, hook=None):
+        """
+        parsed: Set of entities' names that were extracted from user input
+        hook: If not None, called as hook(phase, seconds) with how long each
+          kind of clump took to check ('clumps:AND', 'clumps:OR', 'clumps:XOR')
+        
+        Enforce AND/OR/XOR rules; see _Handler.enforce_clumps().
+        """
+        p = self._mask(parsed)
+        if hook is None:
+            # Entities to eliminate for each clump
+            # (elimination means it was received as expected)
+            successes = [self._successes(kind, ok, p) for kind, ok, _ in self._KINDS]
+            for _, _, check in self._KINDS:
+                check(self, parsed, p, *successes)
+            return True
+        
+        successes, spent = [], []
+        for kind, ok, _ in self._KINDS:
+            start = perf_counter()
+            successes.append(self._successes(kind, ok, p))
+            spent.append(perf_counter() - start)
+        for (kind, _, check), before in zip(self._KINDS, spent):
+            start = perf_counter()
+            try:
+                check(self, parsed, p, *successes)
+            finally:
+                hook('clumps:' + kind, before + perf_counter() - start)
+        return True
+    
+    def _enforce_and(self, parsed, p, and_suc, or_suc, xor_suc):
+        for all_failed in self._own['AND']:
+            if _and_ok(all_failed, p):
+                continue
+            # AND failure == member of an AND clump that was not given
+            # an AND failure is okay if it's in a satisfied OR clump or a satisfied XOR clump
+            received = all_failed & p
+            not_exempt = all_failed & ~received & ~or_suc & ~xor_suc
+            if not_exempt:
+                raise errors.ANDError(
+                  'Expected all of the following flags/arguments/commands: {}\n(Got {})'.format(
+                      ', '.join(self._extract_names(self._names(all_failed))),
+                      ', '.join(self._extract_names(self._names(received))) or 'none'
+                    ),
+                  **self._details(
+                    parsed, and_suc, or_suc, xor_suc,
+                    failed=all_failed, eliminating=received, not_exempt=not_exempt
+                    )
+                  )
+    
+    def _enforce_or(self, parsed, p, and_suc, or_suc, xor_suc):
+        for all_failed in self._own['OR']:
+            if _or_ok(all_failed, p):
+                continue
+            # OR failure == member of an OR clump where none were given
+            # an OR failure is okay if it's in a satisfied XOR clump
+            not_exempt = all_failed & ~xor_suc
+            if not_exempt:
+                raise errors.ORError(
+                  'Expected at least one of the following flags/arguments/commands: {}\n(Got none)'.format(
+                      ', '.join(self._extract_names(self._names(all_failed)))
+                    ),
+                  **self._details(
+                    parsed, and_suc, or_suc, xor_suc,
+                    failed=all_failed, eliminating=0, not_exempt=not_exempt
+                    )
+                  )
+    
+    def _enforce_xor(self, parsed, p, and_suc, or_suc, xor_suc):
+        for all_failed in self._own['XOR']:
+            if _xor_ok(all_failed, p):
+                continue
+            # XOR failure == member of an XOR clump that was given alongside at least one other
+            # an XOR failure is okay if it satisfies an AND clump
+            not_received = all_failed & ~p
+            not_exempt = all_failed & p & ~and_suc
+            if not_exempt & (not_exempt - 1):  # i.e. more than one bit set
+                raise errors.XORError(
+                  'Expected no more than one of the following flags/arguments/commands: {}\n(Got {})'.format(
+                      ', '.join(self._extract_names(self._names(all_failed))),
+                      ', '.join(self._extract_names(self._names(all_failed & p)))
+                    ),
+                  **self._details(
+                    parsed, and_suc, or_suc, xor_suc,
+                    failed=all_failed, eliminating=not_received, not_exempt=not_exempt
+                    )
+                  )
+    
+    # Each kind of clump with how to tell if one is satisfied and how to enforce
+    # them, in the order they're enforced in
+    _KINDS = (('AND', _and_ok, _enforce_and), ('OR', _or_ok, _enforce_or), ('XOR', _xor_ok, _enforce_xor))
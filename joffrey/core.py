@@ -4,28 +4,77 @@ this sucks too but less
 """
 import os
 import sys
-import shlex
-from functools import partial
-from itertools import chain, zip_longest, starmap
+import threading
+from array import array
+from collections import deque
+from functools import lru_cache, partial, wraps
+from itertools import chain, islice, zip_longest, starmap
+from time import perf_counter
 
 from . import errors
-from .clumps import And, Or, Xor, ClumpSet
-from .entities import Entity, Arg, Flag
-from .misc import JoffreyNamespace, _Null
+from .clumps import And, Or, Xor, ClumpEngine, ClumpSet
+from .entities import Entity, Arg, Flag, edits
+from .inputs import Arguments, Tokens, expand_response_files, picked
+from .misc import Deferred, JoffreyNamespace, LazyNamespace, _Null, isawaitable, shell_split
+from .stats import timed
+from .table import ParseTable
 
 
 _FILE = os.path.basename(sys.argv[0])
+# Environment variable that makes parse() print completions instead
+_COMPLETE_VAR = 'JOFFREY_COMPLETE'
+
+# .quiet is true on threads whose help output is being suppressed (see parse_many())
+_output = threading.local()
+
+
+def _rendered(method):
+    """
+    Caches a (zero-arg) HelperMixin method's result in the handler's
+    _help_cache, which is emptied whenever the handler's entities change,
+    for as long as none of the entities' attributes are reassigned either
+    """
+    @wraps(method)
+    def wrapper(self):
+        current = edits()
+        cached_edits, result = self._help_cache.get(method.__name__, (None, None))
+        if cached_edits != current:
+            result = method(self)
+            self._help_cache[method.__name__] = (current, result)
+        return result
+    return wrapper
+
+
+class _HelpCallback:
+    """
+    Callback of the default help flag. (Not a lambda, so that
+    parsers can be pickled)
+    """
+    __annotations__ = {}
+    
+    def __init__(self, parser):
+        self.parser = parser
+        # Not an identifier, so no alias gets created from it
+        self.__name__ = '<help>'
+    
+    def __call__(self, name=None):
+        return self.parser.cli_help(name)
 
 
 class HelperMixin:
     """
     Provides help-screen functionality to Handlers.
     A bit convoluted; needs reworking.
+    
+    Everything rendered is cached until the handler's entities are next
+    added, removed or modified (see _Handler._invalidate() and
+    _rendered()), and lists entities in the order they were defined in.
     """
     
     @property
     def all_commands(self):
-        return {*self.commands, *(name for g in self._groups for name in g.commands)}
+        # (dict keys for a set-like view that keeps definition order)
+        return dict.fromkeys(chain(self.commands, *(g.commands for g in self._groups))).keys()
     
     @property
     def all_flags(self):
@@ -36,6 +85,7 @@ class HelperMixin:
         return map(self.getarg, self.args)
     
     @property
+    @_rendered
     def usage_info(self):
         return '{}{} {} {}'.format(
           _FILE,
@@ -45,6 +95,12 @@ class HelperMixin:
           )
     
     @property
+    @_rendered
+    def commands_info(self):
+        return ', '.join(map(str, self.all_commands))
+    
+    @property
+    @_rendered
     def help_info(self):
         return '{}\n{}'.format(
           self._label_format('args'),
@@ -54,10 +110,10 @@ class HelperMixin:
     def _label_format(self, label):
         return '{}\n{}'.format(
           label.upper(),
-          '\n'.join({
+          '\n'.join(dict.fromkeys(
             '\t{: <15} {}'.format(i.name, i.brief)
             for i in getattr(self, 'all_' + label)
-            })
+            ))
           )
     
     def format_help(self, usage=True, commands=True, help=True):
@@ -65,15 +121,20 @@ class HelperMixin:
         if usage:
             built.append('usage: {}'.format(self.usage_info))
         if commands and self.commands:
-            built.append('commands: {}'.format(', '.join(map(str, self.all_commands))))
+            built.append('commands: {}'.format(self.commands_info))
         if help:
             if usage or commands:
                 built.append('')
             built.append(self.help_info)
         return '\n'.join(built)
     
+    @staticmethod
+    def _print(*args, **kwargs):
+        if not getattr(_output, 'quiet', False):
+            print(*args, **kwargs)
+    
     def print_help(self, usage=True, commands=True, help=True):
-        print(self.format_help(usage, commands, help), end='\n\n')
+        self._print(self.format_help(usage, commands, help), end='\n\n')
     
     def error(self, exc=None, help=True):
         self.print_help(help=help)
@@ -81,6 +142,17 @@ class HelperMixin:
             raise SystemExit
         raise SystemExit(exc if str(exc) else type(exc))
     
+    @property
+    @_rendered
+    def alias_index(self):
+        """
+        {entity name: tuple of its aliases}
+        """
+        index = {}
+        for alias, name in self._aliases.items():
+            index.setdefault(name, []).append(alias)
+        return {name: tuple(aliases) for name, aliases in index.items()}
+    
     def cli_help(self, name=None):
         """
         name: name of entity to provide help for
@@ -92,20 +164,20 @@ class HelperMixin:
         
         entity = self.get(name)
         if entity is None:
-            print('No helpable entity named', repr(name))
+            self._print('No helpable entity named', repr(name))
             raise SystemExit
         
         short = getattr(entity, 'short', '')
         try:
-            aliases = ', '.join(map(repr, (k for k, v in self._aliases.items() if v == entity.name and k != short)))
+            aliases = ', '.join(repr(k) for k in self.alias_index.get(entity.name, ()) if k != short)
         except AttributeError:
             aliases = ''
         
         name = str(entity).lstrip()
         if aliases:
-            print('', name, 'aliases: {}'.format(aliases), entity.help, sep='\n')
+            self._print('', name, 'aliases: {}'.format(aliases), entity.help, sep='\n')
         else:
-            print('', name, entity.help, sep='\n')
+            self._print('', name, entity.help, sep='\n')
         raise SystemExit
 
 
@@ -123,6 +195,11 @@ class _Handler:
     _xor: XOR clumps
     _required: Set of all entities created with required=True
       (for which to raise an error if not provided)
+    _eager: Set of identifiers of flags whose callbacks should
+      run during parsing even if the parser is lazy
+    _table: Compiled ParseTable, or None if stale
+    _generation: How many times this handler's entities have changed
+    _help_cache: {name: (entities.edits() when rendered, help/usage text)} rendered since entities last changed
     
     arg_map: Dict of {arg name: joffrey.entity.Arg object}
     commands: Dict of {command name: joffrey.core.Command object}
@@ -145,6 +222,10 @@ class _Handler:
         self._xor = ClumpSet()
         
         self._required = set()
+        self._eager = set()
+        self._table = None
+        self._generation = 0
+        self._help_cache = {}
     
     def __repr__(self):
         quote = "'" if hasattr(self, 'name') else ''
@@ -180,6 +261,23 @@ class _Handler:
     def dealias(self, name):
         return self._aliases.get(name, name)
     
+    def __getstate__(self):
+        # Compiled tables aren't picklable; they're just rebuilt when needed
+        state = vars(self).copy()
+        state['_table'] = None
+        # (nor is an executor)
+        state.pop('callback_executor', None)
+        return state
+    
+    def _invalidate(self):
+        """
+        Mark this handler's compiled ParseTable and rendered help
+        as stale (called whenever its entities change)
+        """
+        self._table = None
+        self._generation += 1
+        self._help_cache = {}
+    
     def remove(self, obj):
         name = obj.identifier if isinstance(obj, Entity.cls) else self.dealias(obj)
         if name in self.arg_map:
@@ -196,6 +294,7 @@ class _Handler:
         else:
             raise KeyError('No such entity: {}'.format(obj))
         self._aliases = {k: v for k, v in self._aliases.items() if v != name}
+        self._invalidate()
     
     def get(self, name):
         """
@@ -254,6 +353,7 @@ class _Handler:
         if XOR is not _Null:
             self._xor.add(Xor(XOR, self))
             Xor(XOR, self).add(obj)
+        self._invalidate()
     
     def enforce_clumps(self, parsed, groups=None):
         """
@@ -261,89 +361,10 @@ class _Handler:
         groups: Clump-groups to take into account when checking
         
         Enforce AND/OR/XOR rules. Mostly the 'heart' of joffrey.
+        (The actual checking is done by a ClumpEngine; parsers use the
+        one cached in their ParseTable rather than compiling a new one.)
         """
-        
-        # Entities to eliminate for each clump
-        # (elimination means it was receieved as expected)
-        elim = {
-          'AND': self.parent_and.successes(parsed),
-          'OR': self.parent_or.successes(parsed),
-          'XOR': self.parent_xor.successes(parsed)
-          }
-        
-        def extract_names(collection):
-            """
-            Only used if no groups were given to enforce_clumps()
-            (which means there's no nesting to take care of, which
-            in turn means a simple repr over everything will do)
-            """
-            return map(repr, collection)
-        
-        if groups is not None:
-            def extract_names(collection):
-                """[Visually group together] group's entity names"""
-                return (
-                  '[{}]'.format(', '.join(map(repr, groups[n].entity_names)))
-                  if n in groups else repr(n) for n in collection
-                  )
-            _g_clumps = {lbl: {groups.get(s) for s in successes.intersection(groups)} for lbl, successes in elim.items()}
-            elim = {lbl: elim[lbl] | {name for g in grps for name in g.entity_names} for lbl, grps in _g_clumps.items()}
-        
-        err_details = {
-          'parsed': parsed,
-          'groups': groups,
-          'handler': repr(self),
-          'AND_SUC': elim['AND'],  # SUC = SUCCESSES
-          'OR_SUC': elim['OR'],
-          'XOR_SUC': elim['XOR'],
-          }
-        
-        for all_failed, received in self._and.failures(parsed):
-            # AND failure == member of an AND clump that was not given
-            # an AND failure is okay if it's in a satisfied OR clump (i.e. there's at least one other OR in its clump that was given)
-            # or if it's in a satisfied XOR clump (i.e. exactly one other XOR in its clump was given)
-            not_exempt = (all_failed - received) - elim['OR'] - elim['XOR']
-            if not_exempt:
-                raise errors.ANDError(
-                  'Expected all of the following flags/arguments/commands: {}\n(Got {})'.format(
-                      ', '.join(extract_names(all_failed)),
-                      ', '.join(extract_names(received)) or 'none'
-                    ),
-                  **err_details,
-                  failed=all_failed, eliminating=received, not_exempt=not_exempt
-                  )
-        
-        for all_failed, received in self._or.failures(parsed):
-            # OR failure == member of an OR clump where none were given
-            # an OR failure is okay if it's in a satisfied XOR clump (i.e. exactly one other XOR in its clump was given)
-            not_exempt = (all_failed - received) - elim['XOR']
-            if not_exempt:
-                raise errors.ORError(
-                  'Expected at least one of the following flags/arguments/commands: {}\n(Got none)'.format(
-                      ', '.join(extract_names(all_failed))
-                    ),
-                  **err_details,
-                  failed=all_failed, eliminating=received, not_exempt=not_exempt
-                  )
-        
-        for all_failed, not_received in self._xor.failures(parsed):
-            # XOR failure == member of an XOR clump that was given alongside at least one other
-            # an XOR failure is okay if it satisfies an AND clump (i.e. all other ANDs in its clump were given)
-            ######################################################################################
-            #  XXX: SHOULD it be okay if it satisfies an OR clump? What about if it's required?  #
-            #  That is: should this actually say `- elim['AND'] - elim['OR'] - self._required`?  #
-            ######################################################################################
-            not_exempt = (all_failed - not_received) - elim['AND']
-            if len(not_exempt) > 1:
-                raise errors.XORError(
-                  'Expected no more than one of the following flags/arguments/commands: {}\n(Got {})'.format(
-                      ', '.join(extract_names(all_failed)),
-                      ', '.join(extract_names(all_failed-not_received))
-                    ),
-                  **err_details,
-                  failed=all_failed, eliminating=not_received, not_exempt=not_exempt
-                  )
-        return True
+        return ClumpEngine(self, groups).enforce(parsed)
     
     def clump(self, *, AND=_Null, OR=_Null, XOR=_Null):
         """
@@ -359,19 +380,23 @@ class _Handler:
             return entity
         return inner
     
-    def arg(self, n=1, *, required=False, default=_Null, namespace=None, help=None):
+    def arg(self, n=1, *, required=False, default=_Null, namespace=None, namespace_copy='deep', stream=False, help=None):
         """
         n: number of times this arg should be received consecutively; ... for infinite
         required: Whether this arg is required to be provided
         default: Default value if this arg is not provided
         namespace: Dict with which to initialize Arg entity's namespace (for storing state between repeated calls)
+          or a zero-arg callable returning such a dict
+        namespace_copy: How to copy a dict namespace for each parse: 'deep' or 'shallow'
+        stream: Whether to call the callback (only if n is ...) once with an iterator
+          over all its values, converted as they're drawn, rather than once per value
         help: Help text for this arg (preferably None: defaults to function's __doc__)
 
         Decorator that registers its decorated function as a positional argument
         """
         def inner(cb):
             repeat_count = n
-            entity = Arg(cb, n, namespace=namespace, help=help)
+            entity = Arg(cb, n, namespace=namespace, namespace_copy=namespace_copy, stream=stream, help=help)
             self.arg_map[entity.name] = entity
             if required:
                 self._required.add(entity.name)
@@ -381,10 +406,11 @@ class _Handler:
             if default is not _Null:
                 self._defaults[entity.name] = default
             self.args.extend([entity.name] * repeat_count)
+            self._invalidate()
             return entity
         return inner
     
-    def flag(self, dest=None, short=_Null, *, aliases=(), required=False, default=_Null, namespace=None, help=None, _='-'):
+    def flag(self, dest=None, short=_Null, *, aliases=(), required=False, default=_Null, namespace=None, namespace_copy='deep', eager=False, help=None, _='-'):
         """
         dest: What this flag's name should be in the final resultant JoffreyNamespace
         short: Shorthand alias for this flag; _Null => first available letter, None = no short alias
@@ -392,12 +418,15 @@ class _Handler:
         required: Whether this flag is required to be provided
         default: Default value if this flag is not provided
         namespace: Dict with which to initialize Flag entity's namespace (for storing state between repeated calls)
+          or a zero-arg callable returning such a dict
+        namespace_copy: How to copy a dict namespace for each parse: 'deep' or 'shallow'
+        eager: Whether to run this flag's callback during parsing even if the parser is lazy
         help: Help text for this flag (preferably None: defaults to function's __doc__)
 
         Decorator that registers its decorated function as a flag/option
         """
         def inner(cb):
-            entity = Flag(cb, namespace=namespace, name=dest, help=help, _=_)
+            entity = Flag(cb, namespace=namespace, namespace_copy=namespace_copy, name=dest, help=help, _=_)
             # filter out '<lambda>'
             if cb.__name__.isidentifier():
                 self._aliases[cb.__name__] = entity.name
@@ -412,8 +441,11 @@ class _Handler:
                 self._defaults[entity.identifier] = default
             if required:
                 self._required.add(entity.name)
+            if eager:
+                self._eager.add(entity.identifier)
             self._aliases.update(dict.fromkeys(aliases, entity.name))
             self.flags[entity.name] = entity
+            self._invalidate()
             return entity
         return inner
     
@@ -448,34 +480,67 @@ class ParserBase(_Handler, HelperMixin):
     _groups: Clump-groups present in this parser
     _prepared_parse: A functools.partial that is set once prepare() is called
     _result: The result of _prepared_parse(), once called
+    _table_lineage: _lineage() as of when _table was compiled
+    _lock: Held while compiling _table (per-parse state is all local
+      to do_parse(), so parsing itself needs no lock)
+    _result_lock: Held while computing _result, so that it's only computed once
     
     desc: Helptext (a short description of this parser)
     flag_prefix: What to prefix shorthand flags with
     long_prefix: flag_prefix*2, used to prefix long-form flags
     systemexit: Whether to raise SystemExit on error or just fail w/ the original exception
+    compact: Whether parse results should be CompactNamespaces rather than JoffreyNamespaces
+    lazy: Whether to defer callbacks until their results are accessed
+    abbrev: Whether long flags can be abbreviated to any unique prefix
+    response_files: Whether parse() expands @path arguments into the arguments listed in path
+    instrument: Function that parsing reports how long each of its phases took to, if any
+    callback_executor: Executor that parse() runs callbacks in, if any (only CLIs set this)
     """
     
-    def __init__(self, desc='', flag_prefix='-', *, systemexit=True, no_help=False):
+    callback_executor = None
+    
+    def __init__(self, desc='', flag_prefix='-', *, systemexit=True, no_help=False, compact=False, lazy=False, abbrev=False, response_files=False, instrument=None):
         """
         desc: Helptext (a short description of this parser)
         flag_prefix: What to prefix shorthand flags with (long prefix is this*2)
         systemexit: Whether to raise SystemExit on error or just fail w/ the original exception
         no_help: Whether NOT to create a default help command
+        compact: Whether to return parse results as slotted, tuple-backed
+          CompactNamespaces (same interface, much less memory per result)
+        lazy: Whether to only validate input while parsing, and run each
+          (non-eager) entity's callback the first time its result is accessed
+        abbrev: Whether to accept any unambiguous prefix of a long flag's name
+          or alias in its place (e.g. --verb for --verbosity)
+        response_files: Whether parse() should replace each @path argument with
+          the arguments in path, one per line (read lazily; see joffrey.inputs)
+        instrument: If not None, called as instrument(phase, seconds) with how long
+          each phase of each parse took, e.g. a joffrey.stats.ParseStats
         """
+        if compact and lazy:
+            raise ValueError('Compact results cannot be lazy')
         super().__init__()
         self.desc = desc
         self.flag_prefix = flag_prefix
         self.long_prefix = 2 * flag_prefix
         self.systemexit = systemexit
+        self.compact = compact
+        self.lazy = lazy
+        self.abbrev = abbrev
+        self.response_files = response_files
+        self.instrument = instrument
         self._groups = set()
         self._prepared_parse = None
         self._result = None
+        self._table_lineage = ()
+        self._lock = threading.RLock()
+        self._result_lock = threading.RLock()
         if not flag_prefix:
             raise ValueError('Flag prefix cannot be empty')
         if not no_help:
             self.flag('help',
+              eager=True,
               help="Prints help and exits\nIf given a valid NAME, displays that entity's help"
-            )(lambda name=None: self.cli_help(name))
+            )(_HelpCallback(self))
     
     def __setattr__(self, name, val):
         """
@@ -490,11 +555,22 @@ class ParserBase(_Handler, HelperMixin):
         if val._required:
             self._required.add(name)
         
-        self._groups.add(val)
         self._clump(val, val._and, val._or, val._xor)
         
         SubHandler.__init__(val, self, name)
+        self._groups.add(val)
         object.__setattr__(self, name, val)
+        self._invalidate()
+    
+    def __getstate__(self):
+        state = super().__getstate__()
+        del state['_lock'], state['_result_lock']
+        return state
+    
+    def __setstate__(self, state):
+        vars(self).update(state)
+        self._lock = threading.RLock()
+        self._result_lock = threading.RLock()
     
     @property
     def defaults(self):
@@ -512,9 +588,50 @@ class ParserBase(_Handler, HelperMixin):
         if self._prepared_parse is None:
             return self.defaults
         if self._result is None:
-            self._result = self._prepared_parse()
+            # (Not _lock, so callbacks can still compile this or any
+            # other parser while it's held, even from other threads)
+            with self._result_lock:
+                if self._result is None:
+                    self._result = self._prepared_parse()
         return self._result
     
+    def _lineage(self):
+        """
+        return: _generation of each handler above this one, since a
+          subcommand's compiled clumps include its parents' (checked
+          when compiling, so that defining things on a parser doesn't
+          have to go through all of its subcommands)
+        """
+        lineage = []
+        handler = getattr(self, 'parent', None)
+        while handler is not None:
+            lineage.append(handler._generation)
+            handler = getattr(handler, 'parent', None)
+        return tuple(lineage)
+    
+    def compile(self):
+        """
+        return: This parser's ParseTable
+        
+        Flattens flags, aliases, group members, commands and arg slots
+        into a single ParseTable, which is what parsing consults from
+        then on. Happens automatically on the first parse; adding or
+        removing entities afterward (here or in a parent parser) makes
+        the table stale, and it'll be recompiled the next time it's needed.
+        Subcommands aren't compiled along with their parent, only
+        once they're parsed (or completed) themselves.
+        Safe to call from several threads at once; only one compiles.
+        """
+        table, lineage = self._table, self._lineage()
+        if table is None or self._table_lineage != lineage:
+            with self._lock:
+                table = self._table
+                if table is None or self._table_lineage != lineage:
+                    table = ParseTable.from_handler(self)
+                    # (Only visible to other threads once it's complete)
+                    self._table_lineage, self._table = lineage, table
+        return table
+    
     def dealias(self, name):
         try:
             return next(g.dealias(name) for g in self._groups if g.hasany(name))
@@ -565,14 +682,20 @@ class ParserBase(_Handler, HelperMixin):
         # (is it intentional? I don't remember... my bad for not commenting as soon as I wrote it.)
         return super().hasany(name) or self._aliases.get(name, _Null) in self.arg_map
     
-    def enforce_clumps(self, parsed):
+    def enforce_clumps(self, parsed, hook=None):
+        """
+        hook: Function to report how long each kind of clump took to check to, if any
+        
+        See _Handler.enforce_clumps()
+        """
+        table = self.compile()
         # p is a set of `parsed` PLUS names of all groups that have entities in `parsed`
         # because the group names are what this parser's and/or/xor clumps will be looking for
-        p = set(parsed).union(next((g.name for g in self._groups if g.hasany(i)), None) for i in parsed) - {None}
+        p = {*parsed, *(table.group_of[i] for i in parsed if i in table.group_of)}
         return (
-          super().enforce_clumps(p, {g.name: g for g in self._groups})
+          table.clumps.enforce(p, hook)
           and
-          all(g.enforce_clumps(parsed) for g in self._groups if g.name in p)
+          all(engine.enforce(parsed, hook) for name, engine in table.group_clumps.items() if name in p)
           )
     
     def _put_nsp(self, namespaces, entity):
@@ -583,14 +706,16 @@ class ParserBase(_Handler, HelperMixin):
 
         Since namespaces are local to each parse-session, they can
         be stored in a single dict (viz. namespaces) of {entity: nsp}.
+        Each is only created (copied from the entity's) the first time
+        its entity is seen in a session.
         """
-        return entity if entity.namespace is None else partial(
-          entity,
-          namespaces.setdefault(
-            entity.name,
-            JoffreyNamespace(**entity.namespace)
-            )
-          )
+        if entity._new_namespace is None:
+            return entity
+        try:
+            nsp = namespaces[entity.name]
+        except KeyError:
+            nsp = namespaces[entity.name] = JoffreyNamespace(**entity._new_namespace())
+        return partial(entity, nsp)
     
     def _check_skip(self, value):
         """
@@ -599,19 +724,70 @@ class ParserBase(_Handler, HelperMixin):
         """
         return value.startswith(self.flag_prefix) or value == '--'
     
+    def _count_flag_args(self, inp, idx, argcount):
+        """
+        inp: Input to parse
+        idx: Position in inp just past a flag
+        argcount: How many arguments the flag takes at most
+        return: How many arguments starting at idx the flag gets: up to
+          argcount of them, cut short by the next flag or end-of-flags sentinel
+        
+        Looks no further ahead than the flag could take arguments from,
+        and everything it looks at is then skipped by the caller, so the
+        input is never scanned more than once in all (even if it's a run
+        of millions of positionals, e.g. from a response file).
+        """
+        count = 0
+        if not argcount:
+            return count
+        for value in inp[idx:idx + argcount]:
+            if self._check_skip(value):
+                break
+            count += 1
+        return count
+    
+    def _unabbreviate(self, table, name):
+        """
+        table: This parser's ParseTable
+        name: Long flag name (sans prefix) that isn't itself in table.flags
+        return: Name of the one flag that `name` is a prefix of the name or
+          an alias of, or `name` itself if there's no such flag
+        raises: errors.AmbiguityError if there are several such flags
+        
+        Goes through table.flag_index, so it's O(log n) in the number of
+        flags (plus however many of them start with `name`).
+        """
+        start = len(self.long_prefix)
+        # {entity: first of its names that `name` is a prefix of}
+        matches = {}
+        for word in table.flag_index.complete(self.long_prefix + name):
+            matches.setdefault(table.flags[word[start:]], word)
+        if len(matches) > 1:
+            candidates = sorted(self.long_prefix + entity.name for entity in matches)
+            raise errors.AmbiguityError(
+              'Ambiguous flag {!r} (could be {})'.format(self.long_prefix + name, ', '.join(candidates)),
+              flag=self.long_prefix + name,
+              candidates=candidates,
+              )
+        return next(iter(matches.values()), self.long_prefix + name)[start:]
+    
     def _extract_flargs(self, inp, strict=False, propagate_unknowns=False):
         """
         inp: Input to parse
         strict: Whether to disallow unknown flags / excessive positional args
         propagate_unknowns: Whether unknown flags should be regarded as
           an error or just bubbled up to parent handler
-        return: flags+args found, subcommand (if any), and unknown flags to propagate
+        return: (flag, its args) pairs found, indices in inp of positional args
+          found, subcommand (if any), and unknown flags to propagate
         
         Extract flags/args from user input and return both.
         """
+        table = self.compile()
         # args/flags found so far
+        # (args by index rather than value, so that a huge run of positionals
+        # read lazily from a response file isn't all copied into a list)
         flags = []
-        args = []
+        args = array('Q')
         # number of elements to skip (used when flag has multiple args)
         skip = 0
         # subcommand, if any
@@ -636,20 +812,22 @@ class ParserBase(_Handler, HelperMixin):
             
             if (not allow_flags) or (not value.startswith(self.flag_prefix) or value in (self.flag_prefix, self.long_prefix)):
                 # Then value is a command or positional argument
-                if self.hascmd(value):
-                    command = (value, idx)
+                if value in table.commands:
+                    command = (*table.commands[value], idx)
                     # Commands consume everything to their right, so no point parsing further
                     break
-                args.append(value)
-                # self._last_arg_consumes == infinite args allowed
-                if not self._last_arg_consumes and len(args) > len(self.args):
+                args.append(idx - 1)
+                # table.last_arg_consumes == infinite args allowed
+                if not table.last_arg_consumes and len(args) > len(table.args):
                     too_many_args = True
             elif allow_flags:
                 if '=' in value:
                     # Then it's passing a single arg to the flag
                     name, arg = value.lstrip(self.flag_prefix).split('=', 1)
-                    if self.hasflag(name):
-                        flags.append((self.dealias(name), [arg] if arg else []))
+                    if self.abbrev and name not in table.flags and value.startswith(self.long_prefix):
+                        name = self._unabbreviate(table, name)
+                    if name in table.flags:
+                        flags.append((table.flags[name], [arg] if arg else []))
                     elif propagate_unknowns:
                         unknown_flags.append(('', value.split('=')[0], [arg] if arg else []))
                     else:
@@ -658,16 +836,16 @@ class ParserBase(_Handler, HelperMixin):
                 
                 if value.startswith(self.long_prefix):
                     name = value.lstrip(self.flag_prefix)
-                    if self.hasflag(name):  # long-form flag name
-                        skip = self.getflag(name).argcount
-                        next_pos = next((i for i, v in enumerate(inp[idx:]) if self._check_skip(v)), len(inp))
-                        if next_pos < skip:
-                            skip = next_pos
-                        flags.append((self.dealias(name), inp[idx:skip+idx]))
+                    if self.abbrev and name not in table.flags:
+                        name = self._unabbreviate(table, name)
+                    if name in table.flags:  # long-form flag name
+                        entity = table.flags[name]
+                        skip = self._count_flag_args(inp, idx, entity.argcount)
+                        flags.append((entity, inp[idx:skip+idx]))
                     elif propagate_unknowns:
                         # Below is commented out because there's no way of knowing how many args the flag accepts
                         # if it's not this parser's own
-                        #skip = next((i for i, v in enumerate(inp[idx:]) if self._check_skip(v)), len(inp))
+                        #skip = self._count_flag_args(inp, idx, sys.maxsize)
                         #unknown_flags.append(('', value, inp[idx:skip+idx]))
                         unknown_flags.append(('', value, []))
                     else:
@@ -675,12 +853,10 @@ class ParserBase(_Handler, HelperMixin):
                     continue
                 
                 for name in value[1:]:  # collection of shorthand flag names (like '-xcvf')
-                    if self.hasflag(name):
-                        skip = self.getflag(name).argcount
-                        next_pos = next((i for i, v in enumerate(inp[idx:]) if self._check_skip(v)), len(inp))
-                        if next_pos < skip:
-                            skip = next_pos
-                        flags.append((self.dealias(name), inp[idx:skip+idx]))
+                    if name in table.flags:
+                        entity = table.flags[name]
+                        skip = self._count_flag_args(inp, idx, entity.argcount)
+                        flags.append((entity, inp[idx:skip+idx]))
                     elif propagate_unknowns:
                         unknown_flags.append((value[0], name, []))
                     else:
@@ -688,55 +864,91 @@ class ParserBase(_Handler, HelperMixin):
         
         if strict:
             if too_many_args:
-                if self.commands and not self.args:
+                if self.commands and not table.args:
                     raise TypeError(
                       'Expected a command: {}\n'
                       'Try `--help <command name>` for specific detail'
                       .format(', '.join(map(repr, self.commands)))
                       )
                 raise TypeError('Too many positional arguments (expected {}, got {})'.format(
-                  len(self.args), len(args)
+                  len(table.args), len(args)
                   ))
             if unknown_flags and not propagate_unknowns:
                 raise TypeError('Unknown flag(s): ' + ' '.join(starmap("`{}{}'".format, unknown_flags)))
         return flags, args, command, unknown_flags if propagate_unknowns else []
     
-    def do_parse(self, inp=None, strict=False, systemexit=True, propagate_unknowns=False):
+    def do_parse(self, inp=None, strict=False, systemexit=True, propagate_unknowns=False, pending=None):
         """
         inp: List of command-line args to parse
         strict: Whether to disallow excessive args and/or unknown non-propagable flags
         systemexit: Whether to raise SystemExit on error or just fail with the original exception
         propagate_unknowns: Whether to bubble up unknown flags to parent handler
+        pending: If not None, a list to add (result dict, name) to for each entity whose
+          callbacks are put off (as a Deferred, or an awaitable from an eager one)
+          rather than run; the result is then a Deferred that builds the namespace
+          once those have been replaced with their results (see parse_async())
         return: Parsed-out JoffreyNamespace from inp, unknown flags found
         
         Backend to parse() -- does the actual parsing and returns result + unknown flags to propagate
         """
+        table = self.compile()
+        hook = self.instrument
         parsed = {}
-        flags, positionals, command, unknown_flags = self._extract_flargs(inp, strict, propagate_unknowns)
+        extract_flargs = self._extract_flargs if hook is None else timed(hook, 'extract', self._extract_flargs)
+        flags, arg_indices, command, unknown_flags = extract_flargs(inp, strict, propagate_unknowns)
+        positionals = picked(inp, arg_indices)
         # Namespaces to be passed to entities in current run
         # (nsps are parse-session-local)
         namespaces = {}
         prep = partial(self._put_nsp, namespaces)
+        if hook is not None:
+            put_nsp = prep
+            
+            def prep(entity):
+                return timed(hook, 'callback:' + entity.identifier, put_nsp(entity))
         
-        for flag, args in flags:
-            if self.hasflag(flag):
-                entity = self.getflag(flag)
+        if self.lazy or pending is not None:
+            def call(entity, args):
+                if entity.identifier in table.eager:
+                    result = parsed[entity.identifier] = prep(entity)(*args)
+                    if pending is not None and isawaitable(result):
+                        pending.append((parsed, entity.identifier))
+                    return
+                deferred = parsed.get(entity.identifier)
+                if not isinstance(deferred, Deferred):
+                    deferred = parsed[entity.identifier] = Deferred()
+                    if pending is not None:
+                        pending.append((parsed, entity.identifier))
+                deferred.calls.append((prep(entity), args))
+        else:
+            def call(entity, args):
                 parsed[entity.identifier] = prep(entity)(*args)
         
-        if self._last_arg_consumes and len(positionals) > len(self.args):
-            # Fill zipped_args with the Arg that's meant to consume trailing values
-            zipped_args = zip_longest(map(self.getarg, self.args), positionals, fillvalue=self.getarg(self.args[-1]))
-        else:
-            zipped_args = zip(map(self.getarg, self.args), positionals)
+        for entity, args in flags:
+            call(entity, args)
         
-        for entity, value in zipped_args:
-            parsed[entity.identifier] = prep(entity)(value)
+        if table.last_arg_consumes and table.args[-1].stream:
+            # The consuming arg gets everything from its slot on in one go,
+            # as an iterator (zip() stops drawing from positionals once the
+            # other args run out, so it's left holding exactly that)
+            for entity, value in zip(table.args[:-1], positionals):
+                call(entity, (value,))
+            if len(arg_indices) >= len(table.args):
+                call(table.args[-1], (positionals,))
+        else:
+            if table.last_arg_consumes and len(arg_indices) > len(table.args):
+                # Fill zipped_args with the Arg that's meant to consume trailing values
+                zipped_args = zip_longest(table.args, positionals, fillvalue=table.args[-1])
+            else:
+                zipped_args = zip(table.args, positionals)
+            
+            for entity, value in zipped_args:
+                call(entity, (value,))
         
         if command is not None:
-            value, idx = command
-            command, cmd_obj = self._aliases.get(value, value), self.getcmd(value)
+            command, cmd_obj, idx = command
             try:
-                parsed[command], cmd_unknown_flags = cmd_obj.do_parse(inp[idx:], strict, systemexit, propagate_unknowns)
+                parsed[command], cmd_unknown_flags = cmd_obj.do_parse(inp[idx:], strict, systemexit, propagate_unknowns, pending)
             except Exception as e:
                 if systemexit is None and cmd_obj.systemexit or systemexit:
                     cmd_obj.error(e, help=False)
@@ -746,42 +958,130 @@ class ParserBase(_Handler, HelperMixin):
                     # The _ is the flag's name, which would only have been used for error output
                     for _, flag, args in cmd_unknown_flags:
                         name = flag.lstrip(self.flag_prefix)
-                        if self.hasflag(name):
-                            entity = self.getflag(name)
-                            parsed[entity.identifier] = prep(entity)(*args)
+                        if self.abbrev and name not in table.flags and flag.startswith(self.long_prefix):
+                            name = self._unabbreviate(table, name)
+                        if name in table.flags:
+                            call(table.flags[name], args)
                         else:
-                            # Propagate yet further
-                            unknown_flags.append((None, name, args))
-        self.enforce_clumps(parsed)
-        # Place defaults first then override them with provided values
-        final = {**self._defaults, **{name: value for g in self._groups for name, value in g._defaults.items()}, **parsed}
-        
-        nsp = JoffreyNamespace(**final)
-        # One final check after enforce_clumps: all required entities must have been provided
-        if self._required.difference(nsp):
+                            # Propagate yet further (prefix and all, so that
+                            # parents can tell long flags from short ones too)
+                            unknown_flags.append((None, flag, args))
+        self.enforce_clumps(parsed, hook)
+        if hook is None:
+            # Place defaults first then override them with provided values
+            final = {**table.defaults, **parsed}
+            # One final check after enforce_clumps: all required entities must have been provided
+            missing = table.required.difference(final)
+        else:
+            start = perf_counter()
+            final = {**table.defaults, **parsed}
+            hook('defaults', perf_counter() - start)
+            start = perf_counter()
+            missing = table.required.difference(final)
+            hook('required', perf_counter() - start)
+        if missing:
             raise errors.RequirementError('Expected the following required arguments: {}\nGot {}'.format(
-              ', '.join(map(repr, self._required)),
-              ', '.join(map(repr, self._required.intersection(nsp))) or 'none'
+              ', '.join(map(repr, table.required)),
+              ', '.join(map(repr, table.required.intersection(final))) or 'none'
               ))
-        return nsp, unknown_flags
+        if pending is not None:
+            build = Deferred()
+            build.calls.append((self._build, (table, parsed)))
+            return build, unknown_flags
+        return self._namespace(table, final), unknown_flags
+    
+    def _namespace(self, table, values):
+        """
+        table: This parser's ParseTable
+        values: {name: value} of a parse's results, defaults included
+        return: values as the kind of namespace this parser's parses produce
+        """
+        if self.compact:
+            return table.record(values)
+        return LazyNamespace(**values) if self.lazy else JoffreyNamespace(**values)
+    
+    def _build(self, table, parsed):
+        """
+        Builds the namespace of a parse_async() once every callback in
+        parsed has been replaced with its result (so the only Deferreds
+        left are subcommands' own _build()s)
+        """
+        return self._namespace(table, {
+          **table.defaults,
+          **{name: value() if type(value) is Deferred else value for name, value in parsed.items()}
+          })
     
     def parse(self, inp=None, *, systemexit=None, strict=False, propagate_unknowns=False):
         """
-        inp: Input to parse, either as a string (which is then shlex.split) or a list of string arguments
+        inp: Input to parse, either as a string (which is then split like shlex.split would) or a list of string arguments
         systemexit: Whether to raise SystemExit on error or just fail with the original exception
         strict: Whether to disallow excessive args and/or unknown non-propagable flags
         propagate_unknowns: Whether to bubble up unknown flags to parent handler
         return: Resultant JoffreyNamespace from parse
 
         Parses user input into an JoffreyNamespace. If systemexit, prints usage info on error.
+        If reading from sys.argv while the JOFFREY_COMPLETE environment variable is set,
+        prints completions for the command line instead and exits (see complete()).
         """
-        if inp is None:
-            inp = sys.argv[1:]
-        if isinstance(inp, str):
-            inp = shlex.split(inp)
+        inp = self._input(inp)
+        try:
+            if self.callback_executor is None:
+                nsp, _ = self.do_parse(self._expand(inp), strict, systemexit, propagate_unknowns)
+            else:
+                nsp = self._parse_in_executor(self._expand(inp), strict, systemexit, propagate_unknowns)
+        except Exception as e:
+            if systemexit is None and self.systemexit or systemexit:
+                self.error(e, help=False)
+            raise
+        except SystemExit:
+            if systemexit is None and self.systemexit or systemexit:
+                raise
+        else:
+            return nsp
+    
+    def _parse_in_executor(self, inp, strict, systemexit, propagate_unknowns):
+        """
+        Backend to parse() when there's a callback_executor: parses like
+        parse_async() does, but then submits each entity's (in-order) calls
+        to the executor, and builds the result once they've all finished
+        """
+        from concurrent.futures import wait
+        
+        pending = []
+        build, _ = self.do_parse(inp, strict, systemexit, propagate_unknowns, pending)
+        futures = [
+          (parsed, name, self.callback_executor.submit(parsed[name]))
+          for parsed, name in pending
+          if type(parsed[name]) is Deferred
+          ]
+        # (So that nothing's still running if one of them failed)
+        wait([future for _, _, future in futures])
+        for parsed, name, future in futures:
+            parsed[name] = future.result()
+        return build()
+    
+    async def parse_async(self, inp=None, *, systemexit=None, strict=False, propagate_unknowns=False):
+        """
+        Same arguments and return value as parse()
         
+        Parses like parse(), but awaits what callbacks return if it's awaitable
+        (so they can be async def functions). Nothing is called until all of inp
+        has been parsed and its clumps and requirements checked, save for eager
+        flags like help; then each entity's calls are made in order, with those of
+        different entities running concurrently (via asyncio.gather()).
+        """
+        import asyncio
+        
+        inp = self._input(inp)
         try:
-            nsp, _ = self.do_parse(list(inp), strict, systemexit, propagate_unknowns)  # list(inp) is effectively inp.copy()
+            pending = []
+            build, _ = self.do_parse(self._expand(inp), strict, systemexit, propagate_unknowns, pending)
+            
+            async def resolve(parsed, name):
+                value = parsed[name]
+                parsed[name] = await (value.run_async() if type(value) is Deferred else value)
+            await asyncio.gather(*starmap(resolve, pending))
+            nsp = build()
         except Exception as e:
             if systemexit is None and self.systemexit or systemexit:
                 self.error(e, help=False)
@@ -792,6 +1092,155 @@ class ParserBase(_Handler, HelperMixin):
         else:
             return nsp
     
+    def _input(self, inp):
+        """
+        inp: Input as passed to parse()
+        return: inp as a list of arguments, read from sys.argv if None (after
+          completing it and exiting instead if JOFFREY_COMPLETE is set)
+        """
+        if inp is None:
+            if _COMPLETE_VAR in os.environ:
+                self._complete_and_exit()
+            inp = sys.argv[1:]
+        if isinstance(inp, str):
+            inp = shell_split(inp) if self.instrument is None else timed(self.instrument, 'tokenize', shell_split)(inp)
+        return inp
+    
+    def _expand(self, inp):
+        """
+        inp: Result of _input()
+        return: Copy of inp to parse (as a view that the parser and every
+          subcommand can slice without copying), with response files
+          expanded if enabled
+        """
+        if self.response_files:
+            inp = expand_response_files(inp) if self.instrument is None else timed(self.instrument, 'response_files', expand_response_files)(inp)
+        if not isinstance(inp, Arguments):
+            inp = Tokens(inp)  # (the only copy made)
+        return inp
+    
+    def complete(self, words):
+        """
+        words: Command-line arguments, the last of which is a partial
+          (possibly empty) one to be completed
+        return: Sorted list of the flags, aliases and commands that the
+          last word could be completed to in its position
+        
+        Only consults compiled tables (and their prefix indexes), so
+        no callbacks are run and no defaults or clumps are looked at,
+        and only compiles the parsers that words lead through.
+        """
+        parser, table = self, self.compile()
+        *done, current = words or ['']
+        allow_flags = True
+        # How many arguments the last flag seen has yet to take
+        skip = 0
+        for value in done:
+            if skip and not parser._check_skip(value):
+                skip -= 1
+                continue
+            skip = 0
+            if value == '--':
+                allow_flags = False
+            elif allow_flags and value.startswith(parser.flag_prefix) and value not in (parser.flag_prefix, parser.long_prefix):
+                if '=' in value:
+                    continue
+                names = [value.lstrip(parser.flag_prefix)] if value.startswith(parser.long_prefix) else value[1:]
+                if parser.abbrev and value.startswith(parser.long_prefix) and names[0] not in table.flags:
+                    try:
+                        names = [parser._unabbreviate(table, names[0])]
+                    except errors.AmbiguityError:
+                        pass
+                known = [table.flags[name] for name in names if name in table.flags]
+                if known:
+                    skip = known[-1].argcount
+            elif value in table.commands:
+                parser = table.commands[value][1]
+                table = parser.compile()
+                allow_flags = True
+        if allow_flags and current.startswith(parser.flag_prefix):
+            return table.flag_index.complete(current)
+        if skip:
+            # Current word is a flag's argument, which can be anything
+            return []
+        return table.command_index.complete(current)
+    
+    def _complete_and_exit(self):
+        """
+        Prints completions, one per line, for the command line in bash's
+        COMP_LINE (up to COMP_POINT) if set, else for sys.argv[1:]
+        """
+        line = os.environ.get('COMP_LINE')
+        if line is None:
+            words = sys.argv[1:]
+        else:
+            line = line[:int(os.environ.get('COMP_POINT', len(line)))]
+            try:
+                words = shell_split(line)[1:]
+            except ValueError:  # e.g. an unclosed quote in the word being completed
+                words = line.split()[1:]
+            if not line or line[-1].isspace():
+                words.append('')
+        candidates = self.complete(words)
+        if candidates:
+            print(*candidates, sep='\n')
+        raise SystemExit(0)
+    
+    def parse_many(self, inputs, *, strict=False, propagate_unknowns=False, cache_size=1024, processes=None, chunksize=1000):
+        """
+        inputs: Iterable of inputs, each as accepted by parse() (None excluded)
+        strict: Whether to disallow excessive args and/or unknown non-propagable flags
+        propagate_unknowns: Whether to bubble up unknown flags to parent handler
+        cache_size: How many distinct string inputs to remember the split of
+        processes: If not None, how many worker processes to spread inputs across
+        chunksize: How many inputs to send to a worker process at a time
+        return: Generator of parse results in the same order as inputs
+        
+        Parses many inputs against this parser, compiling it only once.
+        Nothing is raised or printed for a bad input: its exception
+        (including SystemExit, e.g. from --help, whose help screen is
+        suppressed) takes the place of its result instead.
+        """
+        if processes is not None:
+            yield from self._parse_many_parallel(inputs, processes, chunksize, strict=strict, propagate_unknowns=propagate_unknowns, cache_size=cache_size)
+            return
+        self.compile()
+        split = lru_cache(maxsize=cache_size)(lambda inp: tuple(shell_split(inp)))
+        for inp in inputs:
+            quiet, _output.quiet = getattr(_output, 'quiet', False), True
+            try:
+                result = self.do_parse(self._expand(split(inp) if isinstance(inp, str) else inp), strict, False, propagate_unknowns)[0]
+            except (Exception, SystemExit) as e:
+                result = e
+            finally:
+                _output.quiet = quiet
+            yield result
+    
+    def _parse_many_parallel(self, inputs, processes, chunksize, **kwargs):
+        """
+        Backend to parse_many(processes=...): pickles this parser once,
+        then farms chunks of inputs out to a process pool (where each
+        worker unpickles it once) and yields results back in order
+        """
+        # (imported here because they're slow to import and rarely needed)
+        import pickle
+        from concurrent.futures import ProcessPoolExecutor
+        
+        pickled = pickle.dumps(self)
+        inputs = iter(inputs)
+        pending = deque()
+        with ProcessPoolExecutor(processes) as executor:
+            # Keep a couple chunks per worker in flight, rather than reading all inputs up front
+            while True:
+                while len(pending) < 2 * processes:
+                    chunk = list(islice(inputs, chunksize))
+                    if not chunk:
+                        break
+                    pending.append(executor.submit(_parse_chunk, pickled, chunk, kwargs))
+                if not pending:
+                    return
+                yield from pending.popleft().result()
+    
     def prepare(self, *args, **kwargs):
         """
         *args, **kwargs: see parse().
@@ -817,9 +1266,27 @@ class ParserBase(_Handler, HelperMixin):
             if not self.hasany(name):
                 raise KeyError('Unknown name {} passed to set_defaults()'.format(name))
         self._defaults.update(kwargs)
+        self._invalidate()
         return self
 
 
+# Parsers that worker processes have unpickled, by their pickle
+_worker_parsers = {}
+
+
+def _parse_chunk(pickled, chunk, kwargs):
+    """
+    Run in worker processes by ParserBase.parse_many()
+    """
+    try:
+        parser = _worker_parsers[pickled]
+    except KeyError:
+        import pickle
+        _worker_parsers.clear()
+        parser = _worker_parsers[pickled] = pickle.loads(pickled)
+    return list(parser.parse_many(chunk, **kwargs))
+
+
 class SubHandler(_Handler):
     """
     Base class for handlers that cannot parse, but are 'attached' to handlers that can.
@@ -862,6 +1329,10 @@ class Group(SubHandler):
         self._or = OR
         self._xor = XOR
     
+    def _invalidate(self):
+        # Groups are compiled into their parent's table rather than their own
+        self.parent._invalidate()
+    
     def arg(self, n=1, **kwargs):
         """
         See _Handler.arg()
@@ -870,7 +1341,13 @@ class Group(SubHandler):
         Expected kwargs: _ (str), help (str)
         """
         def inner(cb):
-            entity = Arg(cb, n, namespace=kwargs.get('namespace'), help=kwargs.get('help'))
+            entity = Arg(
+              cb, n,
+              namespace=kwargs.get('namespace'),
+              namespace_copy=kwargs.get('namespace_copy', 'deep'),
+              stream=kwargs.get('stream', False),
+              help=kwargs.get('help')
+              )
             self.arg_map[entity.name] = entity
             if kwargs.get('required'):
                 self._required.add(entity.name)
@@ -882,7 +1359,14 @@ class Group(SubHandler):
         See _Handler.flag().
         """
         def inner(cb):
-            entity = Flag(cb, namespace=kwargs.get('namespace'), name=dest, help=kwargs.get('help'), _=kwargs.get('_', '-'))
+            entity = Flag(
+              cb,
+              namespace=kwargs.get('namespace'),
+              namespace_copy=kwargs.get('namespace_copy', 'deep'),
+              name=dest,
+              help=kwargs.get('help'),
+              _=kwargs.get('_', '-')
+              )
             if cb.__name__.isidentifier():
                 self._aliases[cb.__name__] = entity.name
             if short is not None:  # _Null == default; None == none
@@ -907,7 +1391,15 @@ class Command(SubHandler, ParserBase):
     """
     def __init__(self, flag_prefix='-', *, parent, name, desc):
         SubHandler.__init__(self, parent, name)
-        ParserBase.__init__(self, desc, flag_prefix, systemexit=getattr(parent, 'systemexit', True))
+        ParserBase.__init__(
+          self, desc, flag_prefix,
+          systemexit=getattr(parent, 'systemexit', True),
+          compact=getattr(parent, 'compact', False),
+          lazy=getattr(parent, 'lazy', False),
+          abbrev=getattr(parent, 'abbrev', False),
+          response_files=getattr(parent, 'response_files', False),
+          instrument=getattr(parent, 'instrument', None)
+          )
     
     def __str__(self):
         return ' {}'.format(self.name)
@@ -923,6 +1415,7 @@ class Command(SubHandler, ParserBase):
         """
         obj = cls(cli.flag_prefix, parent=parent, name=name, desc=cli.desc)
         obj.__dict__.update(vars(cli))
+        obj._invalidate()
         return obj
     
     @property
@@ -935,6 +1428,16 @@ class CLI(ParserBase):
     The 'main dish', as phrased in the README.
     This is what users import and base their joffrey applications off of.
     """
+    def __init__(self, *args, callback_executor=None, **kwargs):
+        """
+        callback_executor: concurrent.futures.Executor to have parse() run callbacks
+          in, each flag's or arg's in order but different ones' concurrently, or None
+          to run them one after another while parsing
+        *args, **kwargs: See ParserBase.__init__()
+        """
+        super().__init__(*args, **kwargs)
+        self.callback_executor = callback_executor
+    
     def __str__(self):  # for help screen (because main CLI shouldn't show its own name)
         return ''
     
@@ -1,11 +1,32 @@
-import inspect
 import sys
+from importlib import import_module
 from copy import deepcopy
+from functools import partial
 
-from .misc import multiton, typecast
+from .misc import VAR_POSITIONAL, _callable, _empty, _reduce_multiton, cleandoc, multiton, parameters, typecast
 
 
-VAR_POS = inspect.Parameter.VAR_POSITIONAL
+# How many times any entity's attributes have been assigned (which
+# help that's been rendered from them is only good for as long as
+# this stays the same; see joffrey.core._rendered())
+_edits = 0
+
+
+def edits():
+    """
+    return: How many times any entity's attributes have been assigned
+    """
+    return _edits
+
+
+def _lookup(module, qualname):
+    """
+    return: object named by qualname in module
+    """
+    obj = import_module(module)
+    for attr in qualname.split('.'):
+        obj = getattr(obj, attr)
+    return obj
 
 
 @multiton()
@@ -14,7 +35,8 @@ class Entity:
     Base class for flags/positional arguments.
 
     ###  instance attrs  ###
-    _namespace: dict containing namespace-initialization values
+    _namespace: dict containing namespace-initialization values (or a factory returning one)
+    _new_namespace: zero-arg callable returning a fresh copy of _namespace, or None
     _normalized_params: names of arguments this entity takes, formatted prettily
     params: arguments this entity takes
     argcount: how many args this entity can take
@@ -24,19 +46,23 @@ class Entity:
     identifier: custom name if __init__() was given one else func.__name__
     name: identical to identifier but subclasses can override
     """
-    def __init__(self, func, *, name=None, namespace=None, help=None):
+    def __init__(self, func, *, name=None, namespace=None, namespace_copy='deep', help=None):
         """
         func: function this entity is to call
         name: entity's name or func.__name__
-        namespace: dict with which to initialize a namespace if applicable
+        namespace: dict with which to initialize a namespace if applicable,
+          or a zero-arg callable that returns a new such dict
+        namespace_copy: how to copy `namespace` for each parse session if it's
+          a dict: 'deep' (copy.deepcopy) or 'shallow' (dict.copy)
         help: entity's help text or func.__doc__
         """
-        params = inspect.signature(func).parameters
+        params = parameters(func)
         has_nsp = bool(namespace)
-        first_optional = next((i for i, v in enumerate(params.values()) if v.default is not inspect._empty), sys.maxsize)
+        first_optional = next((i for i, v in enumerate(params) if v.default is not _empty), sys.maxsize)
         self._namespace = namespace
-        self.params = list(params)[has_nsp:]
-        self.argcount = sys.maxsize if any(i.kind == VAR_POS for i in params.values()) else len(params) - has_nsp
+        self._new_namespace = self._namespace_factory(namespace, namespace_copy)
+        self.params = [p.name for p in params][has_nsp:]
+        self.argcount = sys.maxsize if any(i.kind == VAR_POSITIONAL for i in params) else len(params) - has_nsp
         self._normalized_params = [
           ('({})'.format(v) if i >= first_optional else v).upper()
           for i, v in enumerate(self.params[:-1])
@@ -47,16 +73,65 @@ class Entity:
                 self._normalized_params.append('{}...'.format(last).upper())
             else:
                 self._normalized_params.append(('({})'.format(last) if len(params) >= first_optional else last).upper())
-        self.func, self.callback = func, typecast(func)
-        self.help = inspect.cleandoc(func.__doc__ or '' if help is None else help)
+        self.func = func
+        self.callback = self._cast(params)
+        help = func.__doc__ or '' if help is None else help
+        self.help = cleandoc(help)
         self.brief = next(iter(self.help.split('\n')), '')
         self.identifier = name or func.__name__
         self.name = self.identifier
     
+    def __setattr__(self, name, value):
+        # (e.g. a flag's short alias can be reassigned after it's defined)
+        global _edits
+        _edits += 1
+        object.__setattr__(self, name, value)
+    
+    def _cast(self, params=None):
+        """
+        params: self.func's parameters() if already known
+        return: self.func wrapped to convert its arguments by their typehints
+        """
+        return typecast(self.func, params)
+    
+    @staticmethod
+    def _namespace_factory(namespace, copy):
+        if namespace is None:
+            return None
+        if callable(namespace):
+            return namespace
+        if copy == 'deep':
+            return partial(deepcopy, namespace)
+        if copy == 'shallow':
+            return namespace.copy
+        raise ValueError("namespace_copy must be 'deep' or 'shallow', not {!r}".format(copy))
+    
     @property
     def namespace(self):
-        # must deepcopy because users can modify the returned dict
-        return deepcopy(self._namespace)
+        # must copy because users can modify the returned dict
+        return None if self._new_namespace is None else self._new_namespace()
+    
+    def __reduce_ex__(self, protocol):
+        # Decorating a module-level function rebinds its name to its entity,
+        # so the function can't be pickled by name... but the entity can
+        module, qualname = getattr(self.func, '__module__', None), getattr(self.func, '__qualname__', '')
+        if module in sys.modules and '<' not in qualname:
+            try:
+                if _lookup(module, qualname) is self:
+                    return _lookup, (module, qualname)
+            except AttributeError:
+                pass
+        return _reduce_multiton(self, protocol)
+    
+    def __getstate__(self):
+        # callback is a closure, so it gets rebuilt rather than pickled
+        state = vars(self).copy()
+        del state['callback']
+        return state
+    
+    def __setstate__(self, state):
+        vars(self).update(state)
+        self.callback = self._cast()
     
     def __call__(self, *args, **kwargs):
         return self.callback(*args, **kwargs)
@@ -93,11 +168,30 @@ class Arg(Entity.cls):
     A positional argument
     name: self.identifier
     repcount: how many times this argument is to be consecutively invoked
+    stream: whether this (consuming) argument's callback is called once with an
+      iterator over all its values rather than once per value
     """
-    def __init__(self, cb, repeat_count, **kwargs):
+    def __init__(self, cb, repeat_count, *, stream=False, **kwargs):
+        if stream and repeat_count is not Ellipsis:
+            raise ValueError('Only consuming args (n=...) can be streamed')
+        self.stream = stream
         super().__init__(cb, **kwargs)
         self.name = self.identifier
         self.repcount = repeat_count
     
+    def _cast(self, params=None):
+        if not self.stream:
+            return super()._cast(params)
+        # The iterator is the last argument; its hint converts each value as it's drawn
+        hint = self.func.__annotations__.get(self.params[-1]) if self.params else None
+        if not _callable(hint):
+            return self.func
+        func = self.func
+        
+        def streamed(*args):
+            *args, values = args
+            return func(*args, map(hint, values))
+        return streamed
+    
     def __str__(self):
         return '{}({})'.format(self.identifier, '...' if self.repcount is Ellipsis else self.repcount)
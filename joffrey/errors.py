@@ -25,3 +25,7 @@ class XORError(JoffreyException):
 
 class RequirementError(JoffreyException):
     pass
+
+
+class AmbiguityError(JoffreyException):
+    pass
@@ -0,0 +1,221 @@
+"""
+Parser input that's only turned into strings as it's read, so
+that arguments from huge response files never have to be held
+in memory all at once
+"""
+import mmap
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from itertools import accumulate
+
+# How sys.argv is decoded (os.fsdecode without the per-call lookups;
+# Python 3.5 has no getfilesystemencodeerrors(), but surrogateescapes on POSIX)
+_FS_ENCODING = sys.getfilesystemencoding()
+_FS_ERRORS = getattr(sys, 'getfilesystemencodeerrors', lambda: 'surrogateescape')()
+
+
+class _View(Sequence):
+    """
+    Read-only sequence whose items are looked up by index in some
+    backing store; slicing returns another view over the same store
+    rather than a copy.
+
+    _start, _stop: Bounds of this view within the backing store
+    """
+    def __init__(self, start, stop):
+        self._start, self._stop = start, stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            view = object.__new__(type(self))
+            vars(view).update(vars(self), _start=self._start + start, _stop=self._start + max(start, stop))
+            return view
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError('argument index out of range')
+        return self._get(self._start + idx)
+
+    def __iter__(self):
+        return map(self._get, range(self._start, self._stop))
+
+    def _get(self, idx):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return '<{} of {} arguments>'.format(type(self).__name__, len(self))
+
+
+class ResponseFile(_View):
+    """
+    Arguments listed one per line in a file (a trailing \\r on a line is
+    ignored, as is a newline at the very end of the file).
+
+    The file is memory-mapped rather than read, and all that's kept
+    in memory is where each line starts; each argument is decoded
+    (like sys.argv is, via os.fsdecode) when it's accessed.
+
+    path: File the arguments come from
+    _buf: mmap of the file
+    _bounds: array of each line's starting offset, plus where the line
+      after the last would start (as if the file ended with a newline)
+    """
+    def __init__(self, path, chunksize=1 << 20):
+        """
+        path: File to read arguments from
+        chunksize: Roughly how many bytes to scan for newlines at a time
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            try:
+                self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files can't be mapped
+                self._buf = b''
+        self._bounds = self._index(self._buf, chunksize)
+        super().__init__(0, len(self._bounds) - 1)
+
+    @staticmethod
+    def _index(buf, chunksize):
+        size = len(buf)
+        bounds = array('Q', [0])
+        start = 0
+        while start < size:
+            # Scan up to the end of whatever line crosses the chunk boundary
+            cut = buf.find(b'\n', start + chunksize)
+            cut = size if cut == -1 else cut + 1
+            lines = buf[start:cut].split(b'\n')
+            if not lines[-1]:
+                # (Chunk ended with a newline)
+                lines.pop()
+            sizes = [len(line) + 1 for line in lines]
+            sizes[0] += start
+            bounds.extend(accumulate(sizes))
+            start = cut
+        return bounds
+
+    def _get(self, idx):
+        # (Every line is followed by a newline, real or not, so just cut it off)
+        line = self._buf[self._bounds[idx]:self._bounds[idx + 1] - 1]
+        if line[-1:] == b'\r':
+            line = line[:-1]
+        return line.decode(_FS_ENCODING, _FS_ERRORS)
+
+
+class Tokens(_View):
+    """
+    Arguments held in one tuple that every slice of them shares, so that
+    handing the rest of the input to a subcommand (or a flag its arguments)
+    doesn't copy anything, however many arguments or levels of commands
+    there are.
+    
+    _buf: The tuple
+    """
+    def __init__(self, args):
+        """
+        args: Arguments to hold (a tuple is used as-is)
+        """
+        self._buf = tuple(args)
+        super().__init__(0, len(self._buf))
+    
+    def __getitem__(self, idx):
+        # (The same as _View's, minus the generality, since parsing slices a lot)
+        if type(idx) is slice and idx.step is None:
+            start, stop, _ = idx.indices(self._stop - self._start)
+            view = object.__new__(Tokens)
+            view._buf, view._start, view._stop = self._buf, self._start + start, self._start + max(start, stop)
+            return view
+        return super().__getitem__(idx)
+    
+    def __iter__(self):
+        return map(self._buf.__getitem__, range(self._start, self._stop))
+    
+    def _get(self, idx):
+        return self._buf[idx]
+
+
+class Arguments(_View):
+    """
+    Several sequences of arguments (lists, ResponseFiles...) chained
+    into one, without copying any of them.
+
+    _parts: The sequences
+    _offsets: Index within the whole at which each part starts, plus the total length
+    """
+    def __init__(self, parts):
+        self._parts = [part for part in parts if len(part)]
+        self._offsets = [0, *accumulate(map(len, self._parts))]
+        super().__init__(0, self._offsets[-1])
+
+    def _get(self, idx):
+        part = bisect_right(self._offsets, idx) - 1
+        return self._parts[part][idx - self._offsets[part]]
+
+    def __iter__(self):
+        # A part at a time, rather than bisecting for every index
+        idx = self._start
+        while idx < self._stop:
+            part = bisect_right(self._offsets, idx) - 1
+            offset = self._offsets[part]
+            stop = min(self._stop, self._offsets[part + 1])
+            yield from self._parts[part][idx - offset:stop - offset]
+            idx = stop
+
+
+def picked(seq, indices):
+    """
+    seq: Sequence of arguments
+    indices: Sorted indices of arguments in seq to pick out
+    return: Iterator over seq[i] for each i in indices
+
+    Views are read a run of consecutive indices at a time (one slice
+    each) rather than going through __getitem__ for every index.
+    """
+    if not isinstance(seq, _View):
+        return map(seq.__getitem__, indices)
+    return _picked_runs(seq, indices)
+
+
+def _picked_runs(seq, indices):
+    start = stop = None
+    for idx in indices:
+        if idx != stop:
+            if start is not None:
+                yield from seq[start:stop]
+            start = idx
+        stop = idx + 1
+    if start is not None:
+        yield from seq[start:stop]
+
+
+def expand_response_files(inp, prefix='@'):
+    """
+    inp: List of command-line arguments
+    prefix: What marks an argument as naming a response file
+    return: inp with each argument of the form @path (before any --)
+      replaced by the arguments in path, or inp itself if there are none
+
+    Arguments in response files are taken literally; @path inside one
+    isn't expanded.
+    """
+    parts, literal = [], []
+    for idx, value in enumerate(inp):
+        if value == '--':
+            literal.extend(inp[idx:])
+            break
+        if value.startswith(prefix) and len(value) > len(prefix):
+            parts.extend([literal, ResponseFile(value[len(prefix):])])
+            literal = []
+        else:
+            literal.append(value)
+    if not parts:
+        return inp
+    parts.append(literal)
+    return Arguments(parts)
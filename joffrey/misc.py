@@ -1,8 +1,13 @@
-import inspect
-from ast import literal_eval
-from functools import partial, wraps
+import re
+import sys
+import threading
+import weakref
+from collections import OrderedDict, namedtuple
+from collections.abc import Awaitable
+from copy import deepcopy
+from functools import lru_cache, partial, wraps
 from itertools import islice, starmap
-from types import SimpleNamespace
+from types import FunctionType, GeneratorType, MethodType, SimpleNamespace
 
 
 _Null = type(
@@ -10,18 +15,150 @@ _Null = type(
   {'__bool__': lambda self: False,
    '__repr__': lambda self: '<_Null>'}
   )()
-VAR_POSITIONAL, KEYWORD_ONLY = inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.KEYWORD_ONLY
+# What inspect would otherwise be imported for (it's most of what
+# importing joffrey would cost, and is only needed for odd callables):
+# inspect.Parameter's kinds, which compare equal to these...
+POSITIONAL_ONLY, POSITIONAL_OR_KEYWORD, VAR_POSITIONAL, KEYWORD_ONLY, VAR_KEYWORD = range(5)
+# ...and code flags
+_CO_VARARGS, _CO_VARKEYWORDS, _CO_COROUTINE, _CO_ITERABLE_COROUTINE = 0x04, 0x08, 0x80, 0x100
+# Default of parameters that have none (in place of inspect.Parameter.empty)
+_empty = type(
+  '_EmptyType', (),
+  {'__repr__': lambda self: '<_empty>'}
+  )()
+_Param = namedtuple('_Param', 'name kind default')
 
 
 def _callable(obj):
-    return callable(obj) and obj is not inspect._empty
+    return callable(obj) and obj is not _empty
+
+
+def isawaitable(obj):
+    """
+    Same as inspect.isawaitable()
+    """
+    return isinstance(obj, Awaitable) or isinstance(obj, GeneratorType) and bool(obj.gi_code.co_flags & _CO_ITERABLE_COROUTINE)
+
+
+def iscoroutinefunction(func):
+    """
+    Same as inspect.iscoroutinefunction(), only importing inspect for
+    partials and things marked with inspect.markcoroutinefunction()
+    """
+    if type(func) is MethodType:
+        func = func.__func__
+    if not hasattr(func, '_is_coroutine_marker'):
+        if type(func) is FunctionType:
+            return bool(func.__code__.co_flags & _CO_COROUTINE)
+        if not hasattr(func, '__code__') and not isinstance(func, partial):
+            return False
+    import inspect
+    return inspect.iscoroutinefunction(func)
+
+
+def cleandoc(doc):
+    """
+    Same as inspect.cleandoc(): strips doc's indentation (as measured
+    from its second line on) and any blank lines around it
+    """
+    lines = doc.expandtabs().split('\n')
+    margin = min((len(line) - len(line.lstrip()) for line in lines[1:] if line.lstrip()), default=0)
+    lines = [lines[0].lstrip(), *(line[margin:] for line in lines[1:])]
+    while lines and not lines[-1]:
+        lines.pop()
+    while lines and not lines[0]:
+        lines.pop(0)
+    return '\n'.join(lines)
 
 
 def convert(hint, val):
     return hint(val) if _callable(hint) else val
 
 
-def typecast(func):
+def _signature(func):
+    import inspect
+    return [
+      _Param(p.name, p.kind, _empty if p.default is p.empty else p.default)
+      for p in inspect.signature(func).parameters.values()
+      ]
+
+
+def parameters(func):
+    """
+    return: (name, kind, default) of each of func's parameters, in
+      the same order and with the same values as inspect.signature's
+      (except that parameters without a default have _empty)
+    
+    Plain functions' parameters are read straight off their code
+    objects, which is several times cheaper than inspect.signature
+    (and CLIs call this for every entity they define), as are bound
+    methods' and plain __call__ methods'; anything else, including
+    functions wrapped with functools.wraps, goes through it.
+    """
+    if type(func) is not FunctionType:
+        call = func.__func__ if type(func) is MethodType else getattr(type(func), '__call__', None)
+        if type(call) is FunctionType and not hasattr(func, '__signature__'):
+            params = parameters(call)
+            # (Minus self)
+            if params and params[0].kind <= POSITIONAL_OR_KEYWORD:
+                return params[1:]
+        return _signature(func)
+    if hasattr(func, '__wrapped__') or hasattr(func, '__signature__'):
+        return _signature(func)
+    code = func.__code__
+    names, npos, nkw = code.co_varnames, code.co_argcount, code.co_kwonlyargcount
+    nposonly = getattr(code, 'co_posonlyargcount', 0)
+    defaults, kwdefaults = func.__defaults__ or (), func.__kwdefaults__ or {}
+    first_default = npos - len(defaults)
+    params = [
+      _Param(
+        name,
+        POSITIONAL_ONLY if i < nposonly else POSITIONAL_OR_KEYWORD,
+        defaults[i - first_default] if i >= first_default else _empty
+        )
+      for i, name in enumerate(names[:npos])
+      ]
+    # co_varnames has keyword-only names before the *args/**kwargs ones
+    idx = npos + nkw
+    if code.co_flags & _CO_VARARGS:
+        params.append(_Param(names[idx], VAR_POSITIONAL, _empty))
+        idx += 1
+    params.extend(_Param(name, KEYWORD_ONLY, kwdefaults.get(name, _empty)) for name in names[npos:npos + nkw])
+    if code.co_flags & _CO_VARKEYWORDS:
+        params.append(_Param(names[idx], VAR_KEYWORD, _empty))
+    return params
+
+
+def _fast_path(func, convs, var_conv, max_args, general):
+    """
+    func: function to wrap
+    convs: converter (or None) for each positional parameter of func
+    var_conv: converter for func's *args, if any
+    max_args: how many positional arguments func accepts
+    general: fallback wrapper that handles any call shape
+    return: wrapper specialized for calls that pass only positional
+      arguments, which is how parsers call their callbacks
+    """
+    if all(c is None for c in convs) and var_conv is None:
+        # Nothing to convert positionally
+        def fast(*args, **kwargs):
+            if kwargs:
+                return general(*args, **kwargs)
+            return func(*args)
+    elif var_conv is None:
+        def fast(*args, **kwargs):
+            if kwargs or len(args) > max_args:
+                return general(*args, **kwargs)
+            return func(*[a if c is None else c(a) for c, a in zip(convs, args)], *args[len(convs):])
+    else:
+        def fast(*args, **kwargs):
+            if kwargs:
+                return general(*args, **kwargs)
+            return func(*[a if c is None else c(a) for c, a in zip(convs, args)], *map(var_conv, args[len(convs):]))
+    return wraps(func)(fast)
+
+
+def typecast(func, params=None):
     """
     Wraps func such that arguments passed to it will be converted
     according to its typehints.
@@ -30,29 +167,45 @@ def typecast(func):
     passed to it; non-callable annotations are not touched.
     If a callable annotates a variadic argument (*, **),
     the annotation will be called on each value therein.
+    
+    Calls that only pass positional arguments take a fast path
+    specialized to func's signature; anything else (keyword
+    arguments, too many positionals) goes through the general one.
+    
+    If func is an async def function, so is the wrapper, and the
+    arguments are converted when its result is awaited.
+    
+    params: func's parameters() if already known
     """
-    def _hint_for(param):
-        return func.__annotations__.get(param.name)
-
-    params = inspect.signature(func).parameters.values()
-    # Gather annotations
+    if params is None:
+        params = parameters(func)
+    # Gather annotations and defaults
+    hints = func.__annotations__
     # ...of positional parameters
-    pos = [_hint_for(p) for p in params if p.kind < VAR_POSITIONAL]
-    var_pos = next((_hint_for(p) for p in params if p.kind == VAR_POSITIONAL), None)
-    pos_defaults = [p.default for p in params if p.kind < VAR_POSITIONAL]
-    
+    pos, pos_defaults = [], []
+    has_var_pos, var_pos = False, None
     # ...of keyword parameters
-    kw = {p.name: _hint_for(p) for p in params if p.kind == KEYWORD_ONLY}
-    var_kw = next((_hint_for(p) for p in params if p.kind > KEYWORD_ONLY), None)
-    kw_defaults = {p.name: p.default for p in params if p.kind == KEYWORD_ONLY}
+    kw, kw_defaults = {}, {}
+    has_var_kw, var_kw = False, None
+    for p in params:
+        hint = hints.get(p.name)
+        if p.kind < VAR_POSITIONAL:
+            pos.append(hint)
+            pos_defaults.append(p.default)
+        elif p.kind == VAR_POSITIONAL:
+            has_var_pos, var_pos = True, hint
+        elif p.kind == KEYWORD_ONLY:
+            kw[p.name] = hint
+            kw_defaults[p.name] = p.default
+        else:
+            has_var_kw, var_kw = True, hint
     
-    @wraps(func)
-    def wrapper(*args, **kwargs):
+    def general(*args, **kwargs):
         args_, kwargs_ = [], {}
         # Can use a consumable generator to keep track of what
         # positionals are left to convert
         arg_iter = iter(args)
-        if len(args) > len(pos) and not var_pos:
+        if len(args) > len(pos) and not has_var_pos:
             # More positional arguments were passed than func accepts
             func(*args, **kwargs)  # raise TypeError
         # Type-convert the positional arguments that were passed as such
@@ -65,11 +218,11 @@ def typecast(func):
             else:
                 args_.append(default)
         # If some positionals aren't present and also don't have defaults,
-        if inspect._empty in args_:
+        if _empty in args_:
             # Then they were simply not passed as positionals,
             # but they may have been passed via keyword:
             for idx, (param, hint, passed) in enumerate(zip(params, pos, args_)):
-                if passed is not inspect._empty:
+                if passed is not _empty:
                     # Only look at those for which nothing was passed
                     continue
                 try:
@@ -79,7 +232,7 @@ def typecast(func):
                     func(*args, **kwargs)  # raise TypeError
         # If func accepts *args and arg_iter has any values left in it, they
         # should be passed to *args
-        if var_pos is not None:
+        if has_var_pos:
             args_.extend(map(var_pos, arg_iter) if _callable(var_pos) else arg_iter)
         # Keyword-parameter typehints:
         for name, hint in kw.items():
@@ -87,15 +240,79 @@ def typecast(func):
                 kwargs_[name] = convert(hint, kwargs[name])
             except KeyError:
                 default = kw_defaults[name]
-                if default is inspect._empty:
+                if default is _empty:
                     # Keyword argument was not passed and has no default
                     func(*args, **kwargs)  # raise TypeError
                 kwargs_[name] = default
         # **kwargs: just convert every value while keeping the dict otherwise intact
-        if var_kw is not None:
+        if has_var_kw:
             kwargs_.update({name: convert(var_kw, val) for name, val in kwargs.items() if name not in kwargs_})
         return func(*args_, **kwargs_)
-    return wrapper
+    
+    cast = _fast_path(
+      func,
+      [hint if _callable(hint) else None for hint in pos],
+      var_pos if _callable(var_pos) else None,
+      sys.maxsize if has_var_pos else len(pos),
+      general
+      )
+    if not iscoroutinefunction(func):
+        return cast
+    
+    @wraps(func)
+    async def cast_async(*args, **kwargs):
+        return await cast(*args, **kwargs)
+    return cast_async
+
+
+# A word as shlex.split (POSIX mode) sees it: runs of unquoted characters,
+# quoted strings and backslash escapes, up to unquoted whitespace...
+_SHELL_WORD = r"""(?:[^ \t\r\n'"\\]+|'[^']*'|"(?:[^"\\]|\\.)*"|\\.)+"""
+# ...or, failing that, an unclosed quote or a trailing backslash
+_SHELL_TOKEN = re.compile(r"""({})|(['"\\])""".format(_SHELL_WORD), re.DOTALL)
+_SHELL_PLAIN_WORD = re.compile(r'[^ \t\r\n]+')
+_SHELL_SPECIAL = re.compile(r'[\'"\\]')
+_SHELL_QUOTING = re.compile(r"""'([^']*)'|"((?:[^"\\]|\\.)*)"|\\(.)""", re.DOTALL)
+# The only escapes double quotes honor (any other backslash is literal)
+_DOUBLE_QUOTED_ESCAPE = re.compile(r'\\([\\"])')
+
+
+def _unquote(match):
+    single, double, escaped = match.groups()
+    if single is not None:
+        return single
+    if double is not None:
+        return _DOUBLE_QUOTED_ESCAPE.sub(r'\1', double)
+    return escaped
+
+
+def shell_split(s):
+    """
+    s: Command line to split into words
+    return: List of words, exactly as shlex.split(s) would return it
+    raises: ValueError on an unclosed quote or a trailing backslash
+    
+    shlex goes through its input one character at a time in Python;
+    this finds whole words with a regex and only post-processes the
+    ones that have quotes or backslashes in them. (If s has none at
+    all, it's split in a single regex pass.)
+    """
+    if not _SHELL_SPECIAL.search(s):
+        return _SHELL_PLAIN_WORD.findall(s)
+    words = []
+    for word, malformed in _SHELL_TOKEN.findall(s):
+        if malformed:
+            # Let shlex raise, so that the error is exactly the same
+            import shlex
+            return shlex.split(s)
+        words.append(_SHELL_QUOTING.sub(_unquote, word) if _SHELL_SPECIAL.search(word) else word)
+    return words
+
+
+_BOOLY = {
+  **dict.fromkeys(('yes', 'y', 'true', 't', '1'), True),
+  **dict.fromkeys(('no', 'n', 'false', 'f', '0'), False),
+  }
 
 
 def booly(arg):
@@ -103,20 +320,58 @@ def booly(arg):
     arg: str representing something boolean-like
     return: boolean representation of `arg`
     """
-    comp = arg.lower()
-    if comp in ('yes', 'y', 'true', 't', '1'):
-        return True
-    elif comp in ('no', 'n', 'false', 'f', '0'):
-        return False
-    else:
-        raise ValueError('Could not convert {!r} to boolean'.format(arg))
+    # (Only lowercasing if it isn't already)
+    value = _BOOLY.get(arg)
+    if value is None:
+        value = _BOOLY.get(arg.lower())
+        if value is None:
+            raise ValueError('Could not convert {!r} to boolean'.format(arg))
+    return value
+
+
+# Shapes of literal that auto() can convert without compiling anything
+# (written out so as to match exactly what literal_eval accepts)
+_INT = re.compile(r'[-+]?(?:0|[1-9][0-9]*)').fullmatch
+_FLOAT = re.compile(r'[-+]?(?:(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?|[0-9]+[eE][-+]?[0-9]+)').fullmatch
+_NAMED = {'True': True, 'False': False, 'None': None}
+# Types of literal that are safe for cached results to share
+_ATOMIC = frozenset({str, bytes, int, float, complex, bool, type(None), type(...)})
+
+
+def _literal_eval(s):
+    # (imported here because ast is slow to import)
+    from ast import literal_eval
+    try:
+        return literal_eval(s)
+    except (SyntaxError, ValueError):
+        return s
+
+
+def _cached_literal_eval(maxsize):
+    """
+    return: _literal_eval() with an LRU cache of the given size,
+      returning copies of results that could be mutated
+    """
+    cached = lru_cache(maxsize=maxsize)(_literal_eval)
+    
+    def literal_eval(s):
+        value = cached(s)
+        return value if type(value) in _ATOMIC else deepcopy(value)
+    literal_eval.cache_info = cached.cache_info
+    return literal_eval
 
 
 class auto:
     """
     Performs literal_eval for whatever it's called on,
     optionally checking types
+    
+    Plain ints, floats and names are converted directly; anything else
+    goes through literal_eval, whose results are cached if a cache size
+    has been set (see auto.set_cache_size())
     """
+    _evaluate = staticmethod(_literal_eval)
+    
     def __new__(cls, obj, *rest):
         if isinstance(obj, str) and not rest:
             return cls._leval(obj)
@@ -155,52 +410,210 @@ class auto:
             ))
         return ret
     
+    @classmethod
+    def set_cache_size(cls, maxsize):
+        """
+        maxsize: how many of the most recently converted strings to
+          remember the literal_eval results of, shared by every auto
+          across every parse; None for no limit, 0 to stop caching
+        
+        Results that could be mutated (lists, dicts...) are copied
+        each time they're returned, so parses never share them.
+        """
+        cls._evaluate = staticmethod(_literal_eval if maxsize == 0 else _cached_literal_eval(maxsize))
+    
     @staticmethod
     def _leval(s):
         """
         s: str to evaluate as literal
         return: literal represented by s (or s itself if none)
         """
-        try:
-            return literal_eval(s)
-        except (SyntaxError, ValueError):
-            return s
+        if not isinstance(s, str):
+            # (not cached, since it may well not be hashable)
+            return _literal_eval(s)
+        if s.isidentifier():
+            # (literal_eval only accepts the names of constants)
+            return _NAMED.get(s, s)
+        if _INT(s):
+            try:
+                return int(s)
+            except ValueError:  # too many digits
+                pass
+        elif _FLOAT(s):
+            return float(s)
+        return auto._evaluate(s)
+
+
+def _weak(obj):
+    """
+    return: weak reference to obj if it supports them, else obj itself
+    (refs hash and compare like their referents while those are alive)
+    """
+    try:
+        return weakref.ref(obj)
+    except TypeError:
+        return obj
+
+
+class _Registry:
+    """
+    Mapping of multiton instances by key, holding each instance only
+    weakly so it's dropped once nothing else uses it. If maxsize isn't
+    None, only that many of the most recently used instances are kept.
+    
+    Safe to use from several threads at once. (The lock is reentrant
+    because instances' weakref callbacks can fire in the middle of
+    another operation on the same thread.)
+    """
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._refs = OrderedDict()
+        self._lock = threading.RLock()
+    
+    def __len__(self):
+        return len(self._refs)
+    
+    def _remove(self, ref):
+        with self._lock:
+            if self._refs.get(ref.key) is ref:
+                del self._refs[ref.key]
+    
+    def get(self, key):
+        with self._lock:
+            try:
+                ref = self._refs[key]
+            except KeyError:
+                return None
+            self._refs.move_to_end(key)
+            return ref()
+    
+    def add(self, key, instance):
+        with self._lock:
+            self._refs[key] = weakref.KeyedRef(instance, self._remove, key)
+            self._refs.move_to_end(key)
+            self.trim()
+    
+    def setdefault(self, key, instance):
+        """
+        return: Live instance already registered under key if any,
+          else instance (which is then registered)
+        """
+        with self._lock:
+            existing = self.get(key)
+            if existing is not None:
+                return existing
+            self.add(key, instance)
+            return instance
+    
+    def trim(self):
+        with self._lock:
+            while self.maxsize is not None and len(self._refs) > self.maxsize:
+                self._refs.popitem(last=False)
+
+
+def _new_multiton(factory):
+    """
+    factory: What a multiton-decorated class's name refers to
+    return: Blank instance of the class itself, for unpickling into
+    """
+    return factory.cls.__new__(factory.cls)
+
+
+def _reduce_multiton(obj, protocol=None):
+    """
+    __reduce_ex__() for instances of multiton-decorated classes, which
+    can't be pickled the usual way because their classes can't be
+    found by name (see multiton.__call__())
+    """
+    state = getattr(obj, '__getstate__', lambda: vars(obj).copy())()
+    return _new_multiton, (type(obj)._multiton,), state
 
 
 class multiton:
     """
     Decorator that turns a class into a multiton;
     sameness is determined by class.__init__() arguments.
+    
+    Instances and the (weakref-able) arguments keying them are
+    only weakly referenced, so a multiton doesn't keep anything
+    alive by itself.
     """
     classes = {}
     
-    def __init__(self, pos=None, *, kw=False, cls=None, hash_by=None):
+    def __init__(self, pos=None, *, kw=False, cls=None, hash_by=None, maxsize=None):
         """
         pos: where to stop reading positional arguments (i.e. read args[:pos])
         kw: whether to take into account keyword arguments
         cls: class to consider this multiton a part of (i.e. class to instantiate
           when user tries to instantiate the decorated class)
         hash_by: a hash function for when args/kwargs are mutable
+        maxsize: if not None, how many of the most recently used instances of
+          cls to keep track of (see multiton.set_maxsize())
         """
         self.class_ = cls
         self.kw = kw
         self.pos = pos
         self.hash_func = hash_by
+        self.maxsize = maxsize
     
     def __call__(self, deco_cls):
         cls = self.class_ or deco_cls
-        instances = self.classes.setdefault(cls, {})
+        instances = self.classes.setdefault(cls, _Registry(self.maxsize))
         
         def get_instance(*args, **kwargs):
             key = (args[:self.pos], kwargs) if self.kw else args[:self.pos]
             if self.hash_func is not None:
                 key = tuple(map(self.hash_func, key))
-            if key not in instances:
-                instances[key] = deco_cls(*args, **kwargs)
-            return instances[key]
+            key = tuple(map(_weak, key))
+            instance = instances.get(key)
+            if instance is None:
+                # (Created outside the registry's lock, which instantiating other
+                # multitons would otherwise nest; if another thread registered one
+                # in the meantime, that one wins)
+                instance = instances.setdefault(key, deco_cls(*args, **kwargs))
+            return instance
         
         get_instance.cls = deco_cls
+        get_instance.registry = instances
+        # The decorated class's name now refers to get_instance, so that's
+        # what pickle can find by name; instances are pickled as calls to
+        # _new_multiton(get_instance) instead of as instances of deco_cls
+        # (unless the class reduces itself, in which case it has to use
+        # _reduce_multiton() when it wants that)
+        get_instance.__module__, get_instance.__qualname__ = deco_cls.__module__, deco_cls.__qualname__
+        get_instance.__name__, get_instance.__doc__ = deco_cls.__name__, deco_cls.__doc__
+        deco_cls._multiton = get_instance
+        if deco_cls.__reduce_ex__ is object.__reduce_ex__:
+            deco_cls.__reduce_ex__ = _reduce_multiton
         return get_instance
+    
+    @classmethod
+    def _registries(cls, of):
+        return cls.classes.values() if of is None else [of.registry]
+    
+    @classmethod
+    def size(cls, of=None):
+        """
+        of: multiton-decorated class (e.g. joffrey.entities.Flag) to get
+          the size of the registry of; None for all registries combined
+        return: number of instances currently registered
+        """
+        return sum(map(len, cls._registries(of)))
+    
+    @classmethod
+    def set_maxsize(cls, maxsize, of):
+        """
+        maxsize: how many of the most recently used instances to keep
+          track of, or None for no limit
+        of: multiton-decorated class whose registry to bound
+        
+        Instances dropped from a registry are still usable, but
+        instantiating with the same arguments will no longer return them.
+        (So there's no bounding every registry at once: joffrey's own
+        entities and clumps rely on being looked up that way.)
+        """
+        of.registry.maxsize = maxsize
+        of.registry.trim()
 
 
 class JoffreyNamespace(SimpleNamespace):
@@ -235,11 +648,184 @@ class JoffreyNamespace(SimpleNamespace):
         return _SubNamespace(self)
 
 
-@multiton(hash_by=id)
+class Deferred:
+    """
+    Calls to one entity's callback that have been put off by a
+    lazy parser; calling this makes them, in order, and returns
+    the result of the last one (as if they'd been made eagerly)
+    """
+    __slots__ = ('calls',)
+    
+    def __init__(self):
+        self.calls = []
+    
+    def __call__(self):
+        ret = None
+        for func, args in self.calls:
+            ret = func(*args)
+        return ret
+    
+    async def run_async(self):
+        """
+        Like calling this, but awaits the result of each call that returns
+        an awaitable (e.g. an async def callback's) before making the next
+        """
+        ret = None
+        for func, args in self.calls:
+            ret = func(*args)
+            if isawaitable(ret):
+                ret = await ret
+        return ret
+
+
+class LazyNamespace(JoffreyNamespace):
+    """
+    JoffreyNamespace whose values may be Deferred callbacks, which
+    are run the first time they're accessed and then replaced with
+    their results. Looking at names alone (`in`, iteration, etc.)
+    doesn't run anything; anything that needs every value does.
+    """
+    def __getattribute__(self, name):
+        value = super().__getattribute__(name)
+        if type(value) is Deferred:
+            value = vars(self)[name] = value()
+        return value
+    
+    def __getattr__(self, name):
+        # (Only reached for names that weren't set, so unlike
+        # JoffreyNamespace's, this doesn't need to look at -- and
+        # thereby run -- anything else)
+        raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+    
+    def _force(self):
+        for name in vars(self):
+            getattr(self, name)
+        return self
+    
+    def __repr__(self):
+        self._force()
+        return super().__repr__()
+    
+    def __eq__(self, other):
+        self._force()
+        return super().__eq__(other)
+    
+    def __contains__(self, name):
+        return name in vars(self)
+    
+    def __getitem__(self, name):
+        return getattr(self, name)
+    
+    @property
+    def _(self):
+        return _SubNamespace(self._force())
+
+
+class _Field:
+    """
+    Descriptor for one field of a CompactNamespace
+    """
+    __slots__ = ('name', 'idx')
+    
+    def __init__(self, name, idx):
+        self.name = name
+        self.idx = idx
+    
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        value = tuple.__getitem__(obj, self.idx)
+        if value is _Null:
+            raise AttributeError(self.name)
+        return value
+
+
+class CompactNamespace(tuple):
+    """
+    Slotted, tuple-backed alternative to JoffreyNamespace with the same
+    interface. Each compiled parser gets its own subclass of this (see
+    compact_namespace()) with one slot per name its parse could produce;
+    names that weren't given hold _Null.
+    
+    (It's still a tuple underneath, so isinstance(..., tuple) is true, but
+    len() and iteration only count the names that were given.)
+    """
+    __slots__ = ()
+    __hash__ = None
+    _fields = ()
+    _index = {}
+    
+    def __new__(cls, values):
+        """
+        values: dict of {name: value} to fill this namespace's fields with
+        """
+        return super().__new__(cls, [values.get(name, _Null) for name in cls._fields])
+    
+    def __reduce__(self):
+        return _rebuild_compact, (self._fields, self._asdict())
+    
+    def __repr__(self):
+        return '{}({})'.format(
+          JoffreyNamespace.__name__,
+          ', '.join('{}={!r}'.format(k, v) for k, v in self._asdict().items())
+          )
+    
+    def _asdict(self):
+        return {name: value for name, value in zip(self._fields, tuple.__iter__(self)) if value is not _Null}
+    
+    def __bool__(self):
+        return any(value is not _Null for value in tuple.__iter__(self))
+    
+    def __eq__(self, other):
+        if isinstance(other, CompactNamespace):
+            other = other._asdict()
+        return self._asdict() == other
+    
+    def __ne__(self, other):
+        return not self == other
+    
+    def __contains__(self, name):
+        idx = self._index.get(name)
+        return idx is not None and tuple.__getitem__(self, idx) is not _Null
+    
+    def __getitem__(self, name):
+        idx = self._index.get(name)
+        value = _Null if idx is None else tuple.__getitem__(self, idx)
+        if value is _Null:
+            raise AttributeError(name)
+        return value
+    
+    def __iter__(self):
+        yield from self._asdict()
+    
+    def __len__(self):
+        return sum(value is not _Null for value in tuple.__iter__(self))
+    
+    @property
+    def _(self):
+        return _SubNamespace(self)
+
+
+@lru_cache(maxsize=256)
+def compact_namespace(fields):
+    """
+    fields: tuple of every name a parse may produce
+    return: CompactNamespace subclass with a slot for each of those names
+    """
+    attrs = {name: _Field(name, idx) for idx, name in enumerate(fields)}
+    attrs.update(__slots__=(), _fields=fields, _index={name: idx for idx, name in enumerate(fields)})
+    return type(CompactNamespace.__name__, (CompactNamespace,), attrs)
+
+
+def _rebuild_compact(fields, values):
+    return compact_namespace(fields)(values)
+
+
 class _SubNamespace:
     def __init__(self, parent):
         self._parent = parent
-        parent_dict = vars(parent)
+        # CompactNamespaces are immutable, so a snapshot of one works as well as vars()
+        parent_dict = parent._asdict() if isinstance(parent, CompactNamespace) else vars(parent)
         self.items = parent_dict.items
         self.keys = parent_dict.keys
         self.values = parent_dict.values
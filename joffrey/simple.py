@@ -1,9 +1,12 @@
-import inspect
-import shlex
 import sys
+from collections import namedtuple
+from functools import partial
 
 from .core import CLI
-from .misc import _Null, JoffreyNamespace, convert
+from .misc import KEYWORD_ONLY, VAR_POSITIONAL, _Null, JoffreyNamespace, convert, isawaitable, shell_split
+
+
+_Param = namedtuple('_Param', 'name kind default annotation')
 
 
 class Simpleton:
@@ -24,13 +27,19 @@ class Simpleton:
         self.commands = {}
         
         self._callback = func
-        self._params = inspect.signature(func).parameters.values()
+        # (Imported here because it's slow to import, and joffrey.core doesn't need it)
+        from inspect import signature
+        # Missing defaults/annotations as _Null/None rather than inspect's placeholder
+        self._params = [
+          _Param(p.name, p.kind, _Null if p.default is p.empty else p.default, None if p.annotation is p.empty else p.annotation)
+          for p in signature(func).parameters.values()
+          ]
         self.cli.desc = func.__doc__ or ''
         
-        pos = [i for i in self._params if i.kind <= inspect.Parameter.VAR_POSITIONAL]
-        flags = [i for i in self._params if i.kind == inspect.Parameter.KEYWORD_ONLY]
+        pos = [i for i in self._params if i.kind <= VAR_POSITIONAL]
+        flags = [i for i in self._params if i.kind == KEYWORD_ONLY]
         
-        self._consuming = pos and pos[-1].kind == inspect.Parameter.VAR_POSITIONAL
+        self._consuming = pos and pos[-1].kind == VAR_POSITIONAL
         self._add_flargs(self.cli, pos, flags)
     
     def __call__(self, *args, **kwargs):
@@ -38,7 +47,7 @@ class Simpleton:
     
     @staticmethod
     def _null_check(val):
-        return val is _Null or val is inspect._empty
+        return val is _Null
     
     @classmethod
     def no_top_level(cls, help=''):
@@ -48,16 +57,15 @@ class Simpleton:
     
     def _add_flargs(self, cli, pos, flags):
         for arg in pos:
-            if arg.kind == inspect.Parameter.VAR_POSITIONAL:
+            if arg.kind == VAR_POSITIONAL:
                 def __hidden(arg):
-                    def __inner(nsp, value):
-                        nsp.accum.append(convert(arg.annotation, value))
-                        return nsp.accum
+                    def __inner(values):
+                        return tuple(map(partial(convert, arg.annotation), values))
                     __inner.__name__ = arg.name
                     return __inner
                 cli.arg(
                   Ellipsis,
-                  namespace={'accum': []},
+                  stream=True,
                   required=False,
                   default=_Null if self._null_check(arg.default) else arg.default,
                 )(__hidden(arg))
@@ -106,21 +114,41 @@ class Simpleton:
         
         args = [
           flags.pop(p.name, ())
-            if p.kind == inspect.Parameter.VAR_POSITIONAL
+            if p.kind == VAR_POSITIONAL
           else flags.pop(p.name)
-            if p.name in flags or p.default is inspect._empty
+            if p.name in flags or p.default is _Null
           else p.default
             for p in self._params
-            if p.kind <= inspect.Parameter.VAR_POSITIONAL
+            if p.kind <= VAR_POSITIONAL
           ]
         
         if self._consuming:
             args.extend(args.pop(-1))
         
         ret = self._callback(*args, **flags)
+        commands = iter(commands)
+        if isawaitable(ret):
+            return self._call_async(ret, None, commands)
         
         for cmd, flargs in commands:
-            cmd.call(**flargs)
+            cmd_ret = cmd.call(**flargs)
+            if isawaitable(cmd_ret):
+                # The rest have to wait for this one, so they can't be called from here
+                return self._call_async(ret, cmd_ret, commands)
+        return ret
+    
+    @staticmethod
+    async def _call_async(ret, cmd_ret, commands):
+        # call() for when a callback (this one's or a command's) is async:
+        # awaits what's pending, then calls the rest of the commands in order
+        if isawaitable(ret):
+            ret = await ret
+        if cmd_ret is not None:
+            await cmd_ret
+        for cmd, flargs in commands:
+            cmd_ret = cmd.call(**flargs)
+            if isawaitable(cmd_ret):
+                await cmd_ret
         return ret
     
     def run(self, inp=None):
@@ -130,7 +158,7 @@ class Simpleton:
         if inp is None:
             inp = sys.argv[1:]
         if isinstance(inp, str):
-            inp = shlex.split(inp)
+            inp = shell_split(inp)
         if not isinstance(self.cli, CLI):
             try:
                 idx = next(
@@ -0,0 +1,74 @@
+"""
+Opt-in timing of what parsing spends its time on (see the `instrument`
+argument of CLI), either handed to a callback as it's measured or totalled
+up per phase by a ParseStats
+"""
+import threading
+from collections import namedtuple
+from time import perf_counter
+
+
+def timed(hook, phase, func):
+    """
+    hook: Called as hook(phase, seconds) after each call to func
+    phase: Name to report func's calls under
+    return: func wrapped to time each of its calls (including ones that raise)
+    """
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            hook(phase, perf_counter() - start)
+    return wrapper
+
+
+class Phase(namedtuple('Phase', 'calls seconds')):
+    """
+    calls: How many times a phase was reported
+    seconds: How long it took in all
+    """
+    __slots__ = ()
+
+
+class ParseStats:
+    """
+    Instrumentation hook that totals up how many times each phase was
+    reported and how long it took, across every parse it's used for.
+    Safe to share between threads (e.g. a CLI's callback_executor's).
+
+    phases: {phase: Phase}, in the order phases were first reported
+    """
+    def __init__(self):
+        self.phases = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, phase, seconds):
+        with self._lock:
+            calls, total = self.phases.get(phase, (0, 0.0))
+            self.phases[phase] = Phase(calls + 1, total + seconds)
+
+    def __getstate__(self):
+        state = vars(self).copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        vars(self).update(state)
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.phases = {}
+
+    def report(self, limit=None):
+        """
+        limit: How many phases to list, if not all of them
+        return: Table of phases, slowest (in total) first
+        """
+        rows = sorted(self.phases.items(), key=lambda item: item[1].seconds, reverse=True)[:limit]
+        width = max((len(phase) for phase, _ in rows), default=0)
+        return '\n'.join(
+          '{:<{}}  {:>8} calls  {:>12.6f} s'.format(phase, width, calls, seconds)
+          for phase, (calls, seconds) in rows
+          )
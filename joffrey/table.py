@@ -0,0 +1,115 @@
+"""
+Flat lookup tables that parsers compile themselves into
+before parsing, so that per-token work doesn't scale with
+the number of groups/aliases a parser has
+"""
+from bisect import bisect_left
+from collections import namedtuple
+from itertools import chain
+from types import MappingProxyType
+
+from .clumps import ClumpEngine
+from .misc import compact_namespace
+
+
+class PrefixIndex:
+    """
+    Sorted collection of words that can find every word
+    starting with a given prefix in O(log n)
+    
+    words: Tuple of the words, sorted
+    """
+    __slots__ = ('words',)
+    
+    def __init__(self, words):
+        self.words = tuple(sorted(set(words)))
+    
+    def __len__(self):
+        return len(self.words)
+    
+    def complete(self, prefix):
+        """
+        return: All words starting with prefix, sorted
+        """
+        words = self.words
+        start = end = bisect_left(words, prefix)
+        while end < len(words) and words[end].startswith(prefix):
+            end += 1
+        return list(words[start:end])
+
+
+class ParseTable(namedtuple('ParseTable', 'flags commands args last_arg_consumes defaults required groups group_of clumps group_clumps fields record eager flag_index command_index')):
+    """
+    Immutable snapshot of everything ParserBase consults while parsing.
+
+    flags: {name, alias, or short alias: Flag entity}
+    commands: {name or alias: (name to store result under, Command object)}
+    args: Arg entities in the order their slots are filled
+    last_arg_consumes: Whether args[-1] consumes all trailing positionals
+    defaults: Defaults of the parser and all its groups, merged
+    required: Names of all entities that must be provided
+    groups: {group name: Group object}
+    group_of: {entity name: name of the group it belongs to}
+    clumps: ClumpEngine enforcing the parser's own (and parents') clumps
+    group_clumps: {group name: ClumpEngine enforcing that group's clumps}
+    fields: Every name a parse can produce
+    record: CompactNamespace subclass with a slot for each of fields, if the
+      handler is compact (else None, since each one is a new class)
+    eager: Identifiers of flags to call right away even if parsing lazily
+    flag_index: PrefixIndex of every way to write a flag (-x, --name, --alias)
+    command_index: PrefixIndex of every command name and alias
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_handler(cls, handler):
+        """
+        handler: joffrey.core.ParserBase object to compile
+        return: ParseTable holding the result of every lookup
+          that handler's parse would otherwise do per token
+        """
+        groups = list(handler._groups)
+        flag_names = {*handler.flags, *handler._aliases}
+        cmd_names = {*handler.commands, *handler._aliases}
+        for g in groups:
+            flag_names.update(g.flags, g._aliases)
+            cmd_names.update(g.commands, g._aliases)
+
+        flags = {name: handler.getflag(name) for name in flag_names if handler.hasflag(name)}
+        commands = {name: (handler._aliases.get(name, name), handler.getcmd(name)) for name in cmd_names if handler.hascmd(name)}
+        args = tuple(map(handler.getarg, handler.args))
+        defaults = {**handler._defaults, **{name: value for g in groups for name, value in g._defaults.items()}}
+        fields = tuple(dict.fromkeys(chain(
+          defaults,
+          (entity.identifier for entity in flags.values()),
+          (entity.identifier for entity in args),
+          (name for name, _ in commands.values())
+          )))
+        
+        groups_by_name = {g.name: g for g in groups}
+        group_of = {}
+        for g in groups:
+            for name in {*g.entity_names, *g._aliases}:
+                if g.hasany(name):
+                    group_of.setdefault(name, g.name)
+
+        return cls(
+          flags=MappingProxyType(flags),
+          commands=MappingProxyType(commands),
+          args=args,
+          last_arg_consumes=handler._last_arg_consumes,
+          defaults=MappingProxyType(defaults),
+          required=frozenset(handler._required),
+          groups=MappingProxyType(groups_by_name),
+          group_of=MappingProxyType(group_of),
+          clumps=ClumpEngine(handler, groups_by_name),
+          group_clumps=MappingProxyType({g.name: ClumpEngine(g) for g in groups}),
+          fields=fields,
+          record=compact_namespace(fields) if handler.compact else None,
+          eager=frozenset(handler._eager),
+          flag_index=PrefixIndex(
+            (handler.flag_prefix if len(name) == 1 else handler.long_prefix) + name
+            for name in flags
+            ),
+          command_index=PrefixIndex(commands),
+          )
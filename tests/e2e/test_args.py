@@ -44,3 +44,22 @@ def test_too_many():
     with pytest.raises(TypeError) as arg_exc:
         cli.parse('fine fine fine BAD', strict=True)  # Too many args
     assert str(arg_exc.value).startswith('Too many positional')
+
+
+def test_streamed():
+    streaming = CLI(systemexit=False, lazy=True)
+    streaming.arg()(lambda value: value)
+    
+    @streaming.arg(..., stream=True, default=())
+    def numbers(values: int):
+        assert not isinstance(values, (list, tuple))
+        return sum(values)
+    
+    @streaming.flag(short='x')
+    def flag():
+        return True
+    
+    assert streaming.parse('a 1 -x 2 3') == {'<lambda>': 'a', 'numbers': 6, 'flag': True}
+    assert streaming.parse('a') == {'<lambda>': 'a', 'numbers': ()}
+    with pytest.raises(ValueError):
+        streaming.arg(2, stream=True)(lambda values: values)
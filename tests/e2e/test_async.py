@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+import joffrey
+from joffrey import CLI
+from joffrey.errors import RequirementError
+from joffrey.misc import typecast
+
+cli = CLI(systemexit=False)
+sub = cli.command('sub')
+calls = []
+events = {}
+
+
+@cli.flag(short='a')
+async def first(value: int):
+    calls.append('first')
+    # Only finishes if second runs at the same time
+    await asyncio.wait_for(events['second'].wait(), 1)
+    events['first'].set()
+    return value
+
+
+@cli.flag(short='b', namespace={'count': 0})
+async def second(nsp):
+    calls.append('second')
+    events['second'].set()
+    await asyncio.wait_for(events['first'].wait(), 1)
+    nsp.count += 1
+    return nsp.count
+
+
+@cli.flag(short='s')
+def sync():
+    calls.append('sync')
+    return 'sync'
+
+
+@sub.flag(required=True)
+async def needed():
+    calls.append('needed')
+    return 'needed'
+
+
+def run(inp):
+    async def main():
+        events.update(first=asyncio.Event(), second=asyncio.Event())
+        return await cli.parse_async(inp)
+    calls.clear()
+    return asyncio.run(main())
+
+
+def test_parse_async():
+    assert run('-a 1 -s -bb sub --needed') == {'first': 1, 'second': 2, 'sync': 'sync', 'sub': {'needed': 'needed'}}
+    assert sorted(calls) == ['first', 'needed', 'second', 'second', 'sync']
+
+
+def test_checks_before_callbacks():
+    with pytest.raises(RequirementError):
+        run('-a 1 -s sub')
+    assert calls == []
+
+
+def test_typecast_async():
+    @typecast
+    async def add(a: int, b: int = 1):
+        return a + b
+    
+    assert asyncio.iscoroutinefunction(add)
+    assert asyncio.run(add('2')) == 3
+
+
+def test_simple_async():
+    order = []
+    
+    @joffrey.simple
+    async def main(a: int, *, flag=None):
+        await asyncio.sleep(0)
+        order.append(('main', a))
+        return a
+    
+    @main.command
+    def cmd(b):
+        order.append(('cmd', b))
+    
+    assert asyncio.run(main.run('1 cmd 2')) == 1
+    assert order == [('main', 1), ('cmd', '2')]
@@ -76,3 +76,16 @@ def test_parser_namespace_attrs():
     assert (not nsp) is False
     assert nsp._.items() == vars(nsp).items()
     assert nsp.verbosity == nsp['verbosity']
+
+
+def test_error_details():
+    with pytest.raises(errors.XORError) as exc:
+        cli.parse('foo --add 1 2 -S "ahh" -v', systemexit=False)
+    details = exc.value.details
+    assert details.failed == {'addition', 'sc'}
+    assert details.not_exempt == {'addition', 'sc'}
+    assert details.parsed == {'addition', 'scream', 'verbosity', 'name', 'sc'}
+    with pytest.raises(errors.ANDError) as exc:
+        cli.parse('foo -v', systemexit=False)
+    assert exc.value.details.failed == {'scream', 'verbosity'}
+    assert exc.value.details.eliminating == {'verbosity'}
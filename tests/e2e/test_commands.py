@@ -74,3 +74,25 @@ def test_arg_failure():
 def test_conv_failure():
     with pytest.raises(ValueError):
         cli.parse('test int what')
+
+
+def test_nested_commands():
+    outer = CLI(systemexit=False)
+    parser = outer
+    for level in range(1, 4):
+        parser = parser.command('cmd{}'.format(level))
+
+        @parser.flag(short='p')
+        def pair(first, second=None):
+            return [first, second]
+    
+    @parser.arg()
+    def rest(value):
+        return value
+    
+    done = outer.parse('cmd1 -p a b cmd2 -p b -p c d cmd3 --pair e f y')
+    assert done.cmd1.pair == ['a', 'b']
+    assert done.cmd1.cmd2.pair == ['c', 'd']
+    assert done.cmd1.cmd2.cmd3.pair == ['e', 'f']
+    assert done.cmd1.cmd2.cmd3.rest == 'y'
+    assert outer.parse('cmd1 --pair a -- cmd2').cmd1.pair == ['a', None]
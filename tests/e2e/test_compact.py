@@ -0,0 +1,65 @@
+import pickle
+
+import pytest
+from joffrey import CLI
+from joffrey.misc import CompactNamespace, JoffreyNamespace
+
+cli = CLI(systemexit=False, compact=True)
+cmd = cli.command('cmd')
+
+
+@cli.arg()
+def name(name):
+    return name
+
+
+@cli.flag(default=0)
+def count():
+    return 1
+
+
+@cli.flag(namespace={'seen': 0})
+def verbose(nsp):
+    nsp.seen += 1
+    return nsp.seen
+
+
+@cmd.arg()
+def integer(value: int):
+    return value
+
+
+def test_compact_interface():
+    done = cli.parse('foo -vvv')
+    assert isinstance(done, CompactNamespace)
+    assert not hasattr(done, '__dict__')
+    assert done.name == done['name'] == 'foo'
+    assert done.verbose == 3
+    assert done.count == 0  # default; also shadows tuple.count
+    assert 'cmd' not in done and 'verbose' in done
+    with pytest.raises(AttributeError):
+        done.cmd
+    with pytest.raises(AttributeError):
+        done['nonexistent']
+    assert dict(done._.items()) == {'name': 'foo', 'count': 0, 'verbose': 3}
+    assert sorted(done) == ['count', 'name', 'verbose']
+    assert len(done) == 3 and isinstance(done, tuple)
+    assert done == {'name': 'foo', 'count': 0, 'verbose': 3}
+    assert done._.pretty()
+
+
+def test_compact_commands():
+    done = cli.parse('foo cmd 4')
+    assert isinstance(done.cmd, CompactNamespace)
+    assert done.cmd.integer == 4
+    assert done == JoffreyNamespace(name='foo', count=0, cmd=JoffreyNamespace(integer=4))
+
+
+def test_only_compact_parsers_get_records():
+    assert cli.compile().record is not None
+    assert CLI().compile().record is None
+
+
+def test_compact_pickles():
+    done = cli.parse('foo -v cmd 4')
+    assert pickle.loads(pickle.dumps(done)) == done
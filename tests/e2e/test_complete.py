@@ -0,0 +1,77 @@
+import pytest
+from joffrey import CLI, Group
+
+cli = CLI(systemexit=False)
+cli.grp = Group()
+build = cli.command('build', aliases=['b'])
+bench = cli.command('bench')
+
+
+@cli.flag(aliases=['loud'])
+def verbose():
+    raise AssertionError('completion ran a callback')
+
+
+@cli.grp.flag(short='q')
+def quiet():
+    pass
+
+
+@cli.flag(short=None)
+def jobs(n):
+    pass
+
+
+@build.flag(short=None)
+def release():
+    pass
+
+
+@build.command('docs').flag(short=None)
+def open_browser():
+    pass
+
+
+def test_complete_top_level():
+    assert cli.complete(['']) == ['b', 'bench', 'build']
+    assert cli.complete(['b']) == ['b', 'bench', 'build']
+    assert cli.complete(['bu']) == ['build']
+    assert cli.complete(['--']) == ['--help', '--jobs', '--loud', '--quiet', '--verbose']
+    assert cli.complete(['-']) == ['--help', '--jobs', '--loud', '--quiet', '--verbose', '-h', '-q', '-v']
+    assert cli.complete([]) == cli.complete([''])
+
+
+def test_complete_nested():
+    assert cli.complete(['-v', 'build', '--']) == ['--help', '--release']
+    assert cli.complete(['b', '--release', 'd']) == ['docs']
+    assert cli.complete(['b', 'docs', '--o']) == ['--open-browser', '--open_browser']
+    # Flag arguments and everything after -- aren't completed as commands/flags
+    assert cli.complete(['--jobs', '']) == []
+    assert cli.complete(['--jobs', '4', 'be']) == ['bench']
+    assert cli.complete(['--', '--']) == []
+
+
+def test_completion_mode(monkeypatch, capsys):
+    monkeypatch.setenv('JOFFREY_COMPLETE', '1')
+    monkeypatch.setenv('COMP_LINE', 'prog build --re')
+    monkeypatch.setenv('COMP_POINT', '15')
+    with pytest.raises(SystemExit) as exc:
+        cli.parse()
+    assert exc.value.code == 0
+    assert capsys.readouterr().out == '--release\n'
+    
+    monkeypatch.setenv('COMP_LINE', 'prog build ')
+    monkeypatch.setenv('COMP_POINT', '11')
+    with pytest.raises(SystemExit):
+        cli.parse()
+    assert capsys.readouterr().out.split() == ['docs']
+
+
+def test_complete_only_compiles_what_it_walks():
+    wide = CLI()
+    commands = [wide.command('cmd{}'.format(i)) for i in range(300)]
+    for cmd in commands:
+        for j in range(10):
+            cmd.flag('flag{}'.format(j), short=None)(lambda: None)
+    assert wide.complete(['cmd7', '--flag1']) == ['--flag1']
+    assert [cmd for cmd in commands if cmd._table is not None] == [commands[7]]
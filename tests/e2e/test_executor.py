@@ -0,0 +1,109 @@
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from joffrey import CLI
+from joffrey.errors import RequirementError
+
+executor = ThreadPoolExecutor(4)
+cli = CLI(systemexit=False, callback_executor=executor)
+sub = cli.command('sub')
+barrier = threading.Barrier(2, timeout=5)
+calls = []
+
+
+@cli.flag(short='a')
+def first(value: int):
+    # Only gets past this if second is running at the same time
+    barrier.wait()
+    return value
+
+
+@cli.flag(short='b')
+def second():
+    barrier.wait()
+    return 'second'
+
+
+@cli.flag(short='v', namespace={'count': 0})
+def verbose(nsp):
+    nsp.count += 1
+    calls.append(nsp.count)
+    return nsp.count
+
+
+@sub.flag(required=True)
+def needed():
+    calls.append('needed')
+    return threading.current_thread()
+
+
+def test_executor():
+    calls.clear()
+    result = cli.parse('-a 1 -b -vvv sub --needed')
+    assert result._.items() >= {'first': 1, 'second': 'second', 'verbose': 3}.items()
+    assert result.sub.needed is not threading.main_thread()
+    assert [call for call in calls if call != 'needed'] == [1, 2, 3]
+
+
+def test_checks_before_callbacks():
+    calls.clear()
+    with pytest.raises(RequirementError):
+        cli.parse('-v sub')
+    assert calls == []
+
+
+def test_pickle_drops_executor():
+    assert pickle.loads(pickle.dumps(cli)).callback_executor is None
+
+
+def test_result_callback_parses_other_cli():
+    other = CLI(systemexit=False)
+    other.flag()(lambda: True)  # (left uncompiled until load() parses with it)
+    loader = CLI(systemexit=False, callback_executor=executor)
+    
+    @loader.flag()
+    def load():
+        return other.parse('--<lambda>')
+    
+    loader.prepare('--load')
+    results = []
+    thread = threading.Thread(target=lambda: results.append(loader.result), daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive(), 'result deadlocked'
+    assert results[0].load == {'<lambda>': True}
+    assert loader.result is results[0]
+
+
+def test_result_parsed_once():
+    started, go = threading.Event(), threading.Event()
+    runs = []
+    once = CLI(systemexit=False)
+    
+    @once.flag()
+    def slow():
+        runs.append(1)
+        started.set()
+        go.wait(5)
+        return len(runs)
+    
+    once.prepare('--slow')
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(once.result), daemon=True) for _ in range(2)]
+    threads[0].start()
+    assert started.wait(5)
+    threads[1].start()
+    threads[1].join(0.1)  # (gives it time to get as far as it would)
+    go.set()
+    for thread in threads:
+        thread.join(5)
+    assert runs == [1]
+    assert len(results) == 2 and results[0] is results[1]
+
+
+def test_pickle_keeps_lock():
+    copy = pickle.loads(pickle.dumps(cli))
+    assert copy._lock is not cli._lock
+    assert copy.parse('-v')['verbose'] == 1
@@ -1,3 +1,5 @@
+import pytest
+
 from joffrey import CLI
 
 cli = CLI()
@@ -25,3 +27,74 @@ def test_double_dash():
 
 def test_propagate_args():
     assert cli.parse('an_argument cmd blah --flag=HEY bloh', strict=True, propagate_unknowns=True) == {'flag': 'HEY', 'arg': 'an_argument', 'cmd': {'arg_': 'bloh'}}
+
+
+def test_variadic_flag_stops_at_next_flag():
+    local = CLI()
+    
+    @local.flag()
+    def many(*values: str):
+        return values
+    
+    local.flag('one')(lambda value=None: value)
+    assert local.parse('--many a b c -o d') == {'many': ('a', 'b', 'c'), 'one': 'd'}
+    assert local.parse('-m a -- b') == {'many': ('a',)}
+    paths = ['p{}'.format(i) for i in range(5000)]
+    assert local.parse(['--many', *paths, '--one']) == {'many': tuple(paths), 'one': None}
+
+
+def test_namespace_copy_strategies():
+    local = CLI()
+    
+    @local.flag(namespace=lambda: {'seen': []})
+    def factory(nsp, value):
+        nsp.seen.append(value)
+        return nsp.seen
+    
+    @local.flag(namespace={'count': 0}, namespace_copy='shallow')
+    def shallow(nsp):
+        nsp.count += 1
+        return nsp.count
+    
+    for _ in range(2):
+        assert local.parse('-f a -f b -sss') == {'factory': ['a', 'b'], 'shallow': 3}
+    with pytest.raises(ValueError):
+        local.flag(namespace={}, namespace_copy='medium')(lambda nsp: None)
+
+
+def test_abbreviations():
+    from joffrey import Group, errors
+    abbr = CLI(systemexit=False, abbrev=True)
+    abbr.grp = Group()
+    sub = abbr.command('sub')
+    
+    @abbr.flag(short=None, aliases=['verbose_mode'])
+    def verbosity(level: int = 1):
+        return level
+    
+    @abbr.grp.flag(short=None)
+    def version():
+        return True
+    
+    @sub.flag(short=None)
+    def dry_run():
+        return True
+    
+    assert abbr.parse('--verbo 2') == {'verbosity': 2}  # also a prefix of an alias, but of the same flag
+    assert abbr.parse('--verbosity=3') == {'verbosity': 3}
+    assert abbr.parse('--verb=3') == {'verbosity': 3}
+    assert abbr.parse('--vers') == {'version': True}
+    assert abbr.parse('sub --dry') == {'sub': {'dry_run': True}}
+    # Unknown flags propagated up from commands are unabbreviated too
+    sub.command('deeper')
+    assert abbr.parse('sub --verb=2', propagate_unknowns=True) == {'verbosity': 2, 'sub': {}}
+    assert abbr.parse('sub deeper --verb', propagate_unknowns=True) == {'verbosity': 1, 'sub': {'deeper': {}}}
+    with pytest.raises(errors.AmbiguityError):
+        abbr.parse('sub --ver', propagate_unknowns=True)
+    with pytest.raises(errors.AmbiguityError) as exc:
+        abbr.parse('--ver')
+    assert exc.value.details.candidates == ['--verbosity', '--version']
+    with pytest.raises(TypeError):
+        abbr.parse('--nope', strict=True)
+    # Off by default
+    assert 'flag' not in cli.parse('--fla X')
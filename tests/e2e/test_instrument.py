@@ -0,0 +1,77 @@
+import pickle
+
+import pytest
+from joffrey import CLI
+from joffrey.errors import ORError
+from joffrey.stats import ParseStats
+
+stats = ParseStats()
+cli = CLI(systemexit=False, instrument=stats)
+sub = cli.command('sub')
+
+
+@cli.clump(OR=0)
+@cli.flag()
+def alpha():
+    return 'alpha'
+
+
+@cli.clump(OR=0)
+@cli.flag(namespace={'count': 0})
+def beta(nsp):
+    nsp.count += 1
+    return nsp.count
+
+
+@sub.flag()
+def zeta():
+    return 'zeta'
+
+
+def test_phases():
+    stats.reset()
+    cli.parse('-bb sub -z')
+    calls = {phase: calls for phase, (calls, _) in stats.phases.items()}
+    assert calls == {
+      'tokenize': 1,
+      'extract': 2,
+      'callback:beta': 2,
+      'callback:zeta': 1,
+      'clumps:AND': 2,
+      'clumps:OR': 2,
+      'clumps:XOR': 2,
+      'defaults': 2,
+      'required': 2,
+      }
+    assert all(seconds >= 0 for _, seconds in stats.phases.values())
+    assert stats.report(limit=1).count('\n') == 0
+
+
+def test_failures_still_reported():
+    stats.reset()
+    with pytest.raises(ORError):
+        cli.parse('sub -z')
+    # The subcommand got all the way through; the top level failed its OR clump
+    assert stats.phases['clumps:OR'].calls == 2
+    assert stats.phases['defaults'].calls == 1
+
+
+def test_custom_hook():
+    seen = []
+    lazy = CLI(systemexit=False, lazy=True, instrument=lambda phase, seconds: seen.append(phase))
+    
+    @lazy.flag()
+    def quiet():
+        return True
+    result = lazy.parse(['-q'])
+    assert 'callback:quiet' not in seen
+    assert result.quiet
+    assert seen[-1] == 'callback:quiet'
+
+
+def test_stats_pickle():
+    stats.reset()
+    cli.parse('-a')
+    copy = pickle.loads(pickle.dumps(stats))
+    copy('extract', 1.0)
+    assert copy.phases['extract'].calls == stats.phases['extract'].calls + 1
@@ -0,0 +1,68 @@
+import pytest
+from joffrey import CLI, Group, errors
+
+cli = CLI(systemexit=False, lazy=True, no_help=True)
+cli.grp = Group(XOR=0)
+calls = []
+
+
+@cli.arg()
+def name(value):
+    calls.append('name')
+    return value
+
+
+@cli.grp.flag(namespace={'count': 0})
+def verbose(nsp):
+    calls.append('verbose')
+    nsp.count += 1
+    return nsp.count
+
+
+@cli.clump(XOR=0)
+@cli.flag()
+def quiet():
+    calls.append('quiet')
+    return True
+
+
+@cli.flag(eager=True)
+def eager():
+    calls.append('eager')
+    return True
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+def test_callbacks_deferred():
+    done = cli.parse('foo -vvv -e')
+    assert calls == ['eager']
+    assert 'verbose' in done and 'quiet' not in done
+    assert done.verbose == 3
+    assert done['verbose'] == 3
+    assert calls == ['eager', 'verbose', 'verbose', 'verbose']
+    assert done == {'name': 'foo', 'verbose': 3, 'eager': True}
+    assert calls.count('name') == 1
+
+
+def test_missing_name_runs_nothing():
+    done = cli.parse('foo -vvv -e')
+    assert not hasattr(done, 'quiet')
+    assert getattr(done, 'missing', None) is None
+    with pytest.raises(AttributeError):
+        done.missing
+    assert calls == ['eager']
+
+
+def test_no_callbacks_on_failure():
+    with pytest.raises(errors.XORError):
+        cli.parse('foo -v -q')
+    assert calls == []
+
+
+def test_compact_lazy_conflict():
+    with pytest.raises(ValueError):
+        CLI(compact=True, lazy=True)
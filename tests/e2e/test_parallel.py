@@ -0,0 +1,35 @@
+import pickle
+
+from joffrey import CLI, Group, errors
+
+cli = CLI(systemexit=False)
+cli.grp = Group(XOR=0)
+cmd = cli.command('cmd', XOR=0)
+
+
+@cli.arg()
+def name(value):
+    return value
+
+
+@cli.grp.flag()
+def loud(text):
+    return text.upper()
+
+
+@cmd.arg(...)
+def numbers(value: int):
+    return value
+
+
+def test_cli_pickles():
+    copy = pickle.loads(pickle.dumps(cli))
+    assert copy.parse('a -l b') == cli.parse('a -l b')
+    assert copy.parse('a cmd 1 2').cmd.numbers == 2
+
+
+def test_parse_many_processes():
+    inputs = ['n{} cmd {}'.format(i, i) for i in range(50)] + ['x -l y cmd 1']
+    results = list(cli.parse_many(inputs, processes=2, chunksize=7))
+    assert results[:-1] == list(cli.parse_many(inputs[:-1]))
+    assert isinstance(results[-1], errors.XORError)
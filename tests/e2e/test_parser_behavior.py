@@ -45,3 +45,87 @@ def test_nonexistents(cli):
 def test__quote_unquote__subnamespace_for_codecov(cli):
     cli.flag('a')(lambda: None)
     cli.parse('-a')._.pretty()
+
+
+def test_compile_is_lazy_and_cached(cli):
+    cli.flag('a')(lambda: None)
+    assert cli._table is None
+    table = cli.compile()
+    assert cli.compile() is table
+    assert 'a' in cli.parse('-a')
+    assert cli._table is table
+
+
+def test_compile_leaves_subcommands_alone(cli):
+    sub = cli.command('sub')
+    sub.flag('b')(lambda: None)
+    cli.compile()
+    assert sub._table is None
+    assert 'b' in cli.parse('sub -b').sub
+    assert sub._table is not None
+
+
+def test_compile_goes_stale(cli):
+    cli.grp = Group()
+    cli.flag('a')(lambda: None)
+    cli.compile()
+    cli.grp.flag('bee', short='b')(lambda: 1)
+    assert cli._table is None
+    assert cli.parse('-b').bee == 1
+    cli.remove('a')
+    assert cli._table is None
+    assert 'a' not in cli.compile().flags
+
+
+def test_help_is_cached_and_ordered(cli, capsys):
+    for name in 'zeta', 'alpha', 'mid':
+        cli.flag(name, short=None)(lambda: None)
+    cli.command('zcmd')
+    cli.command('acmd')
+    help_info = cli.help_info
+    assert cli.help_info is help_info
+    assert help_info.index('zeta') < help_info.index('alpha') < help_info.index('mid')
+    assert list(cli.all_commands) == ['zcmd', 'acmd']
+    
+    cli.flag('new', aliases=['n', 'nu'])(lambda: None)
+    assert cli.help_info is not help_info and 'new' in cli.help_info
+    assert '--new' in cli.usage_info
+    assert cli.alias_index['new'] == ('n', 'nu')
+    with pytest.raises(SystemExit):
+        cli.cli_help('nu')
+    assert "aliases: 'nu'" in capsys.readouterr().out
+
+
+def test_help_sees_entity_changes(cli):
+    flag = cli.flag('loud', short='l')(lambda: None)
+    usage_info = cli.usage_info
+    assert '-l | --loud' in usage_info
+    flag.short = 'L'
+    assert '-L | --loud' in cli.usage_info
+    flag.brief = 'Now documented'
+    assert 'Now documented' in cli.help_info
+
+
+def test_parse_many(cli, capsys):
+    cli.arg()(lambda value: value)
+    cli.command('cmd').arg()(lambda num: int(num))
+    results = list(cli.parse_many(['a', ['b', 'cmd', '1'], 'c cmd x', 'a', '--help', 'cmd --help']))
+    assert results[0] == results[3] == {'<lambda>': 'a'}
+    assert results[1] == {'<lambda>': 'b', 'cmd': {'<lambda>': 1}}
+    assert isinstance(results[2], ValueError)
+    assert isinstance(results[4], SystemExit) and isinstance(results[5], SystemExit)
+    assert capsys.readouterr().out == ''
+    with pytest.raises(SystemExit):
+        cli.parse('--help')
+    assert 'usage' in capsys.readouterr().out
+
+
+def test_parent_changes_stale_subcommand_tables(cli):
+    sub = cli.command('sub')
+    cli_table = cli.compile()
+    sub.flag('b')(lambda: None)
+    assert cli.compile() is cli_table  # (nothing pushed upward or sideways)
+    table = sub.compile()
+    cli.clump(XOR='x')(cli.flag('a')(lambda: None))
+    assert sub._table is table  # not invalidated eagerly...
+    assert sub.compile() is not table  # ...but not reused either
@@ -0,0 +1,53 @@
+import pytest
+from joffrey import CLI
+
+cli = CLI(systemexit=False, response_files=True)
+sub = cli.command('sub')
+seen = []
+
+
+@cli.flag()
+def verbose():
+    return True
+
+
+@sub.arg(...)
+def path(value):
+    seen.append(value)
+    return value
+
+
+@pytest.fixture
+def respfile(tmp_path):
+    seen.clear()
+    path = tmp_path / 'args.txt'
+    path.write_text('-v\nsub\n/a b\n@c\n')
+    return str(path)
+
+
+def test_response_file(respfile):
+    assert cli.parse(['@' + respfile, 'd']) == {'verbose': True, 'sub': {'path': 'd'}}
+    assert seen == ['/a b', '@c', 'd']
+
+
+def test_response_file_in_command(respfile):
+    cli.parse(['sub', '@' + respfile])
+    assert seen == ['sub', '/a b', '@c']
+
+
+def test_response_file_after_double_dash(respfile):
+    assert cli.parse(['sub', '--', '@' + respfile]) == {'sub': {'path': '@' + respfile}}
+
+
+def test_response_files_off(respfile):
+    plain = CLI(systemexit=False)
+    plain.arg()(lambda value: value)
+    assert plain.parse(['@' + respfile]) == {'<lambda>': '@' + respfile}
+
+
+def test_response_file_parse_many(respfile):
+    assert list(cli.parse_many([['@' + respfile, 'd'], '@' + respfile + ' e'])) == [
+      {'verbose': True, 'sub': {'path': 'd'}},
+      {'verbose': True, 'sub': {'path': 'e'}},
+    ]
+    assert seen == ['/a b', '@c', 'd', '/a b', '@c', 'e']
@@ -0,0 +1,87 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from joffrey import CLI, Group
+from joffrey.entities import Flag
+
+THREADS = 16
+
+
+@pytest.fixture(autouse=True)
+def switch_often():
+    # Make threads interleave far more often than they normally would
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def make_cli():
+    cli = CLI(systemexit=False)
+    cli.grp = Group(XOR=0)
+    sub = cli.command('sub')
+    
+    @cli.flag(short='v', namespace={'count': 0})
+    def verbose(nsp):
+        nsp.count += 1
+        return nsp.count
+    
+    @cli.grp.flag(short='x')
+    def ex(value: int):
+        return value
+    
+    @cli.grp.flag(short='y')
+    def why(value):
+        return value
+    
+    @cli.arg()
+    def name(value):
+        return value
+    
+    @sub.arg(..., namespace={'seen': []})
+    def items(nsp, value: int):
+        nsp.seen.append(value)
+        return nsp.seen
+    return cli
+
+
+def inputs(n):
+    return [
+      ('name{} -{} -x {} sub {}'.format(i, 'v' * (i % 4 + 1), i, ' '.join(map(str, range(i % 5)))) if i % 2
+       else 'name{} --why {}'.format(i, i))
+      for i in range(n)
+      ]
+
+
+def test_shared_cli_many_threads():
+    cli = make_cli()
+    # The first parse of each thread races to compile
+    start = threading.Barrier(THREADS)
+    
+    def work(inps):
+        start.wait()
+        return [cli.parse(inp) for inp in inps]
+    
+    inps = inputs(200)
+    with ThreadPoolExecutor(THREADS) as executor:
+        results = list(executor.map(work, [inps] * THREADS))
+    expected = [make_cli().parse(inp) for inp in inps]
+    assert all(result == expected for result in results)
+    assert results[0][1].sub.items == [0]
+    assert results[0][3].verbose == 4
+
+
+def test_concurrent_multitons():
+    def func(value):
+        return value
+    start = threading.Barrier(THREADS)
+    
+    def work(_):
+        start.wait()
+        return Flag(func)
+    
+    with ThreadPoolExecutor(THREADS) as executor:
+        flags = list(executor.map(work, range(THREADS)))
+    assert all(flag is flags[0] for flag in flags)
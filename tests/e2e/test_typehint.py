@@ -68,9 +68,46 @@ def test_auto(parse):
         auto(None, 'not a type')
 
 
+@pytest.mark.parametrize('value', [
+  '0', '-12', '+3', '007', '1_000', '9' * 5000, '1.', '.5', '-2.5e-3', '1E5', '01.5',
+  'True', 'None', 'none', 'if', 'ā', '١', '1j', '...', '[1]', '  1', '',
+  ])
+def test_auto_fast_paths(value):
+    from ast import literal_eval
+    try:
+        expected = literal_eval(value)
+    except (SyntaxError, ValueError):
+        expected = value
+    result = auto(value)
+    assert type(result) is type(expected) and result == expected
+
+
+def test_auto_cache():
+    auto.set_cache_size(2)
+    try:
+        first = auto('[1, 2]')
+        first.append(3)
+        assert auto('[1, 2]') == [1, 2]  # not the mutated object
+        assert auto('"s"') == 's' and auto('(1,)') == (1,)
+        assert auto._evaluate.cache_info().currsize == 2
+    finally:
+        auto.set_cache_size(0)
+    assert auto('[1, 2]') == [1, 2]
+
+
+def test_auto_non_str():
+    assert auto(int)(5) == 5
+    auto.set_cache_size(2)
+    try:
+        assert auto(list)([1]) == [1]
+    finally:
+        auto.set_cache_size(0)
+
+
 def test_booly(parse):
     assert all(parse('-b ' + b).boolish is True for b in ('yes', 'y', 'true', 't', '1'))
     assert all(parse('-b ' + b).boolish is False for b in ('no', 'n', 'false', 'f', '0'))
+    assert parse('-b YES').boolish is True and parse('-b False').boolish is False
     with pytest.raises(ValueError):
         parse('-b not_a_booleanlike_string')
 
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def modules_after(stmt):
+    """
+    return: names of all modules imported after running stmt in a fresh interpreter
+    """
+    out = subprocess.check_output(
+      [sys.executable, '-c', stmt + '; import sys; print(*sys.modules)'],
+      cwd=ROOT, universal_newlines=True
+      )
+    return set(out.split())
+
+
+def test_import_is_lazy():
+    loaded = modules_after('import joffrey')
+    assert not {'joffrey.core', 'joffrey.simple', 'inspect', 'ast'} & loaded
+
+
+def test_lazy_attributes():
+    loaded = modules_after('from joffrey import CLI, simple, booly; assert isinstance(simple, type)')
+    assert 'joffrey.core' in loaded
+    # Only needed for parse_many(processes=...)
+    assert not {'pickle', 'concurrent.futures'} & loaded
+
+
+def test_parsing_needs_no_inspect():
+    loaded = modules_after('from joffrey import CLI; CLI().parse([])')
+    assert not {'inspect', 'ast'} & loaded
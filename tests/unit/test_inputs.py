@@ -0,0 +1,76 @@
+import pytest
+
+from joffrey.inputs import Arguments, ResponseFile, Tokens, expand_response_files, picked
+
+
+@pytest.fixture
+def respfile(tmp_path):
+    def make(content):
+        path = tmp_path / 'args.txt'
+        path.write_bytes(content)
+        return str(path)
+    return make
+
+
+@pytest.mark.parametrize('content, expected', [
+  (b'', []),
+  (b'a\nb c\n', ['a', 'b c']),
+  (b'a\r\nb\r\n', ['a', 'b']),
+  (b'a\n\nb', ['a', '', 'b']),
+  (b'\n', ['']),
+  ('ā\n'.encode(), ['ā']),
+  ])
+def test_response_file_lines(respfile, content, expected):
+    assert list(ResponseFile(respfile(content))) == expected
+
+
+def test_response_file_small_chunks(respfile):
+    words = ['w{}'.format(i) * (i % 5) for i in range(100)]
+    assert list(ResponseFile(respfile('\n'.join(words).encode()), chunksize=7)) == words
+
+
+def test_views(respfile):
+    args = ResponseFile(respfile(b'0\n1\n2\n3\n4\n'))
+    assert len(args) == 5
+    assert args[-1] == '4'
+    assert list(args[1:4]) == ['1', '2', '3']
+    assert list(args[1:4][1:]) == ['2', '3']
+    assert args[1:4][-1] == '3'
+    assert args[::2] == ['0', '2', '4']
+    assert list(args[4:2]) == []
+    with pytest.raises(IndexError):
+        args[5]
+    with pytest.raises(IndexError):
+        args[1:3][2]
+
+
+def test_tokens():
+    buf = ('a', 'b', 'c', 'd')
+    args = Tokens(buf)
+    assert args._buf is buf
+    rest = args[1:][1:]
+    assert rest._buf is buf
+    assert list(rest) == ['c', 'd']
+    assert rest[-1] == 'd'
+    assert list(args[3:1]) == []
+    assert args[::-2] == ['d', 'b']
+    assert list(picked(args, [0, 1, 3])) == ['a', 'b', 'd']
+    with pytest.raises(IndexError):
+        rest[2]
+
+
+def test_arguments(respfile):
+    args = Arguments([['a'], ResponseFile(respfile(b'b\nc\n')), [], ['d', 'e']])
+    assert list(args) == ['a', 'b', 'c', 'd', 'e']
+    assert [args[i] for i in range(-5, 5)] == list(args) * 2
+    assert list(args[2:4]) == ['c', 'd']
+    assert list(picked(args, [0, 2, 3, 4])) == ['a', 'c', 'd', 'e']
+    assert list(picked(['x', 'y'], [1])) == ['y']
+
+
+def test_expand(respfile):
+    path = respfile(b'-v\n@nested\n')
+    assert list(expand_response_files(['x', '@' + path, 'y'])) == ['x', '-v', '@nested', 'y']
+    assert list(expand_response_files(['--', '@' + path])) == ['--', '@' + path]
+    inp = ['@', 'a']
+    assert expand_response_files(inp) is inp
@@ -1,5 +1,152 @@
+import gc
+
 import pytest
 
-from joffrey import CLI
+from joffrey import CLI, Group
+from joffrey.entities import Flag
+from joffrey.misc import multiton, typecast
+
+cli = CLI()
+
+
+@multiton()
+class Pickled:
+    def __init__(self, key):
+        self.key = key
+
+
+def test_typecast_positional():
+    @typecast
+    def add(a: int, b: int = 4, *c: float):
+        return a, b, c
+    assert add('1') == (1, 4, ())
+    assert add('1', '2', '3', '4') == (1, 2, (3.0, 4.0))
+
+
+def test_typecast_unannotated_variadics():
+    @typecast
+    def rest(a: int, *rest):
+        return a, rest
+    assert rest('1', 'x', 'y') == (1, ('x', 'y'))
+    assert typecast(lambda **kw: kw)(a='1') == {'a': '1'}
+
+
+def test_typecast_keywords():
+    @typecast
+    def func(a: int, *, b: int, c: str.upper = 'x'):
+        return a, b, c
+    assert func('1', b='2') == (1, 2, 'x')
+    assert func(a='1', b='2', c='y') == (1, 2, 'Y')
+    with pytest.raises(TypeError):
+        func('1')
+
+
+def test_typecast_bad_arity():
+    @typecast
+    def func(a: int, b=None):
+        return a, b
+    with pytest.raises(TypeError):
+        func()
+    with pytest.raises(TypeError):
+        func('1', '2', '3')
+
+
+def test_multiton_does_not_leak():
+    def build_and_parse():
+        local = CLI()
+        local.grp = Group(XOR=0)
+        local.grp.clump(AND=0)(local.grp.flag('x')(lambda: None))
+        local.command('cmd').arg()(lambda value: value)
+        local.parse('-x cmd 1')._.items()
+    gc.collect()
+    before = multiton.size()
+    for _ in range(20):
+        build_and_parse()
+    gc.collect()
+    assert multiton.size() == before
+
+
+def test_multiton_maxsize():
+    @multiton(maxsize=2)
+    class Thing:
+        def __init__(self, key):
+            self.key = key
+    things = [Thing(i) for i in range(3)]
+    assert multiton.size(Thing) == 2
+    assert Thing(2) is things[2]
+    assert Thing(0) is not things[0]
+    multiton.set_maxsize(1, Thing)
+    assert multiton.size(Thing) == 1
+    with pytest.raises(TypeError):
+        multiton.set_maxsize(1)
+    assert multiton.size(Flag) <= multiton.size()
+
+
+def test_multiton_pickle():
+    import pickle
+    assert Pickled.cls.__qualname__ == 'Pickled' and Flag.cls.__qualname__ == 'Flag'
+    copy = pickle.loads(pickle.dumps(Pickled('a')))
+    assert type(copy) is Pickled.cls and copy.key == 'a'
+    assert pickle.loads(pickle.dumps(Pickled)) is Pickled
+
+
+def test_parameters_match_inspect():
+    import functools
+    import inspect
+    from joffrey.misc import _empty, parameters
+    
+    def wrapper(*args, **kwargs):
+        pass
+    
+    def f1(a, b=1, *c, d, e=2, **f):
+        pass
+    
+    def f2(*, a=3):
+        pass
+    
+    def f3(a, b=(1,), *c):
+        pass
+    
+    class Callable:
+        def __call__(self, a, *b):
+            pass
+        
+        def method(*args):
+            pass
+    
+    instance = Callable()
+    for func in (
+      f1, f2, f3, wrapper, functools.wraps(f1)(wrapper), functools.partial(f3, 0), print,
+      instance, instance.__call__, instance.method, Callable
+      ):
+        expected = [
+          (p.name, p.kind, _empty if p.default is p.empty else p.default)
+          for p in inspect.signature(func).parameters.values()
+          ]
+        assert [tuple(p) for p in parameters(func)] == expected
+
 
-cli = CLI()
\ No newline at end of file
+def test_inspect_stand_ins():
+    import asyncio
+    import functools
+    import inspect
+    from joffrey.misc import cleandoc, isawaitable, iscoroutinefunction
+    
+    for doc in ('', 'one', '\n  a\n    b\n\n', '  first\n\tsecond\n  third  \n', '\n\n', 'x\n   \n  y'):
+        assert cleandoc(doc) == inspect.cleandoc(doc)
+    
+    async def coro():
+        pass
+    
+    class Awaiter:
+        async def method(self):
+            pass
+        
+        def __call__(self):
+            pass
+    
+    for obj in (coro, coro(), print, lambda: None, asyncio.sleep, None, Awaiter(), Awaiter().method, functools.partial(coro)):
+        assert iscoroutinefunction(obj) == inspect.iscoroutinefunction(obj)
+        assert isawaitable(obj) == inspect.isawaitable(obj)
+        if inspect.iscoroutine(obj):
+            obj.close()
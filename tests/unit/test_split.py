@@ -0,0 +1,47 @@
+import random
+import shlex
+
+import pytest
+
+from joffrey.misc import shell_split
+
+
+def split_or_error(split, s):
+    try:
+        return split(s)
+    except ValueError as e:
+        return 'ValueError: {}'.format(e)
+
+
+@pytest.mark.parametrize('s', [
+  '',
+  '   ',
+  'plain words here',
+  ' \t leading\nand\r\ntrailing \t',
+  'vertical\x0btab and\x0cform feed are not separators',
+  '"double quoted" \'single quoted\'',
+  'con"cat"en\'at\'ed',
+  '"" \'\' empty""\'\'',
+  r'esc\ aped \"quote\" \\backslash \n',
+  r'"in \"double\" \\ \$ \n quotes"',
+  r"'no \escapes\ in single'",
+  '"multi\nline" \'multi\nline\'',
+  'unicode ünïcödé "ẅörds"',
+  '# not a comment',
+  '--flag=value --other="quoted value"',
+  '"unclosed',
+  "'unclosed",
+  'trailing\\',
+  '"unclosed then escape\\',
+  '"escaped close\\"',
+])
+def test_split_matches_shlex(s):
+    assert split_or_error(shell_split, s) == split_or_error(shlex.split, s)
+
+
+def test_split_matches_shlex_fuzzed():
+    rng = random.Random(0)
+    alphabet = ['a', 'b', ' ', '\t', '\n', '\r', '\x0b', "'", '"', '\\', '$', '#', '=', '-', 'é']
+    for _ in range(20000):
+        s = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(16)))
+        assert split_or_error(shell_split, s) == split_or_error(shlex.split, s), repr(s)